@@ -14,12 +14,18 @@ Purpose:
 
 from __future__ import annotations
 
-import json
+import mmap
 import tkinter as tk
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from tkinter import ttk
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # stdlib json also accepts UTF-8 bytes
+    from json import loads as _json_loads
+
 
 # ---- quick defaults ----
 DEFAULT_FRONT = 1
@@ -30,9 +36,46 @@ DEFAULT_TURN4 = 0
 DEFAULT_TURN5 = 0
 DEFAULT_TURN6 = 0
 DEFAULT_JSONL_PATH = "robot_position_cartesian.jsonl"
-
-
-@dataclass
+MAX_GAUGE_LOOPS = 8
+GRID_SPACING = 40
+GRID_COLOR = "#e2e8f0"
+
+# (set, cleared) wording for the Front / Up / Left / Flip summary lines.
+BRANCH_LABELS = (
+    ("front", "back"),
+    ("up", "down"),
+    ("lefty", "righty"),
+    ("flip", "non-flip"),
+)
+SUMMARY_TEMPLATE = (
+    "Shoulder: {}\nElbow: {}\nArm side: {}\nWrist style: {}\n"
+    "Turn offsets: J4 {:+d}, J5 {:+d}, J6 {:+d}"
+)
+RMI_JSON_TEMPLATE = (
+    '{\n  "Front": %d,\n  "Up": %d,\n  "Left": %d,\n  "Flip": %d,\n'
+    '  "Turn4": %d,\n  "Turn5": %d,\n  "Turn6": %d\n}'
+)
+
+# Static explainer shown in the canvas help panel.
+HELP_TEXT = (
+    "Front: Picks one shoulder branch for the same XYZWPR target.\n"
+    "1 means front-side branch, 0 means the opposite branch.\n\n"
+    "Up: Picks elbow-up vs elbow-down style posture.\n"
+    "1 = elbow-up, 0 = elbow-down.\n\n"
+    "Left: Picks lefty/righty arm side branch.\n"
+    "1 = lefty style, 0 = righty style.\n\n"
+    "Flip: Picks wrist flip branch.\n"
+    "1 = flip wrist branch, 0 = non-flip branch.\n\n"
+    "Turn4/5/6: Wrist wrap counts for J4/J5/J6.\n"
+    "+1 means one extra full +360 deg turn, -1 means -360 deg.\n"
+    "They keep orientation continuity and cable-friendly wrist posture.\n\n"
+    "Important: Same Cartesian pose can map to multiple joint solutions.\n"
+    "These fields tell FANUC which one to use. Wrong branch can cause\n"
+    "\"position not reachable\" on linear moves."
+)
+
+
+@dataclass(frozen=True, slots=True)
 class FanucConfig:
     front: int = DEFAULT_FRONT
     up: int = DEFAULT_UP
@@ -42,15 +85,26 @@ class FanucConfig:
     turn5: int = DEFAULT_TURN5
     turn6: int = DEFAULT_TURN6
 
-    def clamp(self) -> "FanucConfig":
-        self.front = 1 if int(self.front) else 0
-        self.up = 1 if int(self.up) else 0
-        self.left = 1 if int(self.left) else 0
-        self.flip = 1 if int(self.flip) else 0
-        self.turn4 = int(self.turn4)
-        self.turn5 = int(self.turn5)
-        self.turn6 = int(self.turn6)
-        return self
+    @classmethod
+    def clamped(
+        cls,
+        front=DEFAULT_FRONT,
+        up=DEFAULT_UP,
+        left=DEFAULT_LEFT,
+        flip=DEFAULT_FLIP,
+        turn4=DEFAULT_TURN4,
+        turn5=DEFAULT_TURN5,
+        turn6=DEFAULT_TURN6,
+    ) -> "FanucConfig":
+        return cls(
+            front=1 if int(front) else 0,
+            up=1 if int(up) else 0,
+            left=1 if int(left) else 0,
+            flip=1 if int(flip) else 0,
+            turn4=int(turn4),
+            turn5=int(turn5),
+            turn6=int(turn6),
+        )
 
     def as_rmi_configuration(self) -> dict:
         return {
@@ -63,33 +117,92 @@ class FanucConfig:
             "Turn6": self.turn6,
         }
 
+    def as_tuple(self) -> tuple[int, int, int, int, int, int, int]:
+        return (self.front, self.up, self.left, self.flip, self.turn4, self.turn5, self.turn6)
+
+
+@lru_cache(maxsize=128)
+def _render_summary(key: tuple[int, int, int, int, int, int, int]) -> str:
+    flags = [set_label if bit else clear_label for bit, (set_label, clear_label) in zip(key[:4], BRANCH_LABELS)]
+    return SUMMARY_TEMPLATE.format(*flags, *key[4:])
+
+
+@lru_cache(maxsize=256)
+def _render_rmi_json(key: tuple[int, int, int, int, int, int, int]) -> str:
+    # Same text as json.dumps(cfg.as_rmi_configuration(), indent=2); the shape is fixed.
+    return RMI_JSON_TEMPLATE % key
 
-def _read_latest_config_from_jsonl(path: Path) -> FanucConfig | None:
-    if not path.exists():
-        return None
-    for raw in reversed(path.read_text(encoding="utf-8").splitlines()):
+
+def _iter_lines_reversed(buf: mmap.mmap, stop: int = 0):
+    # Walk line boundaries backwards over a read-only mapping; only the yielded lines are copied.
+    end = len(buf)
+    while end > stop:
+        newline = buf.rfind(b"\n", stop, end)
+        yield buf[newline + 1 if newline != -1 else stop : end]
+        if newline == -1:
+            break
+        end = newline
+
+
+def _read_latest_config_from_jsonl(path: Path, start: int = 0) -> tuple[FanucConfig | None, int]:
+    # Also returns the offset just past the last complete line, where a later
+    # incremental scan can resume without landing in the middle of a record.
+    try:
+        file = open(path, "rb")
+    except OSError:
+        return None, start
+    with file:
+        try:
+            buf = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return None, start
+        with buf:
+            return _find_latest_config(buf, start), max(start, buf.rfind(b"\n", start) + 1)
+
+
+def _find_latest_config(buf: mmap.mmap, start: int) -> FanucConfig | None:
+    for raw in _iter_lines_reversed(buf, stop=start):
         raw = raw.strip()
-        if not raw or not raw.startswith("{"):
+        if not raw or not raw.startswith(b"{"):
+            continue
+        # Cheap C substring scan before paying for a JSON parse.
+        if b'"Configuration"' not in raw:
             continue
         try:
-            packet = json.loads(raw)
-        except json.JSONDecodeError:
+            packet = _json_loads(raw)
+        except ValueError:
             continue
         cfg = packet.get("Configuration")
         if not isinstance(cfg, dict):
             continue
-        return FanucConfig(
-            front=int(cfg.get("Front", DEFAULT_FRONT)),
-            up=int(cfg.get("Up", DEFAULT_UP)),
-            left=int(cfg.get("Left", DEFAULT_LEFT)),
-            flip=int(cfg.get("Flip", DEFAULT_FLIP)),
-            turn4=int(cfg.get("Turn4", DEFAULT_TURN4)),
-            turn5=int(cfg.get("Turn5", DEFAULT_TURN5)),
-            turn6=int(cfg.get("Turn6", DEFAULT_TURN6)),
-        ).clamp()
+        return FanucConfig.clamped(
+            front=cfg.get("Front", DEFAULT_FRONT),
+            up=cfg.get("Up", DEFAULT_UP),
+            left=cfg.get("Left", DEFAULT_LEFT),
+            flip=cfg.get("Flip", DEFAULT_FLIP),
+            turn4=cfg.get("Turn4", DEFAULT_TURN4),
+            turn5=cfg.get("Turn5", DEFAULT_TURN5),
+            turn6=cfg.get("Turn6", DEFAULT_TURN6),
+        )
     return None
 
 
+@lru_cache(maxsize=64)
+def _arm_points(cx: int, cy: int, front: int, up: int, left: int, flip: int):
+    # Branch directions
+    front_dir = 1 if front else -1
+    up_dir = -1 if up else 1
+    side_dir = -1 if left else 1
+    flip_dir = 1 if flip else -1
+
+    base = (cx, cy + 120)
+    shoulder = (cx + side_dir * 70, cy + 30)
+    elbow = (shoulder[0] + front_dir * 160, shoulder[1] + up_dir * 90)
+    wrist = (elbow[0] + front_dir * 130, elbow[1] + up_dir * 45)
+    tool = (wrist[0] + flip_dir * 60, wrist[1] - up_dir * 20)
+    return base, shoulder, elbow, wrist, tool
+
+
 class App:
     def __init__(self, root: tk.Tk):
         self.root = root
@@ -98,6 +211,14 @@ class App:
         self.root.minsize(1000, 620)
 
         self._syncing = False
+        self._redraw_pending = False
+        self._items: dict[str, int] = {}
+        self._gauge_arcs: dict[str, list[int]] = {}
+        self._last_size: tuple[int, int] | None = None
+        self._drawn_key: tuple[int, int, int, int, int, int, int] | None = None
+        self._center = (0, 0)
+        # (path, mtime_ns, size, resume offset, cfg) of the last JSONL load; cfg may be None.
+        self._jsonl_cache: tuple[Path, int, int, int, FanucConfig | None] | None = None
 
         self.front_var = tk.IntVar(value=DEFAULT_FRONT)
         self.up_var = tk.IntVar(value=DEFAULT_UP)
@@ -106,7 +227,19 @@ class App:
         self.turn4_var = tk.IntVar(value=DEFAULT_TURN4)
         self.turn5_var = tk.IntVar(value=DEFAULT_TURN5)
         self.turn6_var = tk.IntVar(value=DEFAULT_TURN6)
+        self._config_vars = (
+            self.front_var,
+            self.up_var,
+            self.left_var,
+            self.flip_var,
+            self.turn4_var,
+            self.turn5_var,
+            self.turn6_var,
+        )
+        self._last_key = FanucConfig().as_tuple()
         self.path_var = tk.StringVar(value=DEFAULT_JSONL_PATH)
+        self._jsonl_path = Path(DEFAULT_JSONL_PATH)
+        self.path_var.trace_add("write", lambda *_: self._update_jsonl_path())
         self.status_var = tk.StringVar(value="Ready.")
         self.summary_var = tk.StringVar()
         self.config_json_var = tk.StringVar()
@@ -169,24 +302,50 @@ class App:
 
         self.canvas = tk.Canvas(self.root, bg="#f6f3eb", highlightthickness=0)
         self.canvas.grid(row=0, column=1, sticky="nsew")
+        self._create_scene_items()
 
     def _add_spin(self, parent: ttk.LabelFrame, text: str, var: tk.IntVar, row: int):
         ttk.Label(parent, text=text).grid(row=row, column=0, sticky="w")
-        ttk.Spinbox(parent, from_=-10, to=10, textvariable=var, width=6).grid(row=row, column=1, padx=(8, 0))
+        # Spinbox edits redraw on arrow clicks, Enter and focus-out, not on every keystroke.
+        spin = ttk.Spinbox(
+            parent,
+            from_=-10,
+            to=10,
+            textvariable=var,
+            width=6,
+            validate="key",
+            validatecommand=(parent.register(self._validate_int), "%P"),
+            command=self._schedule_redraw,
+        )
+        spin.grid(row=row, column=1, padx=(8, 0))
+        spin.bind("<Return>", lambda _: self._schedule_redraw())
+        spin.bind("<FocusOut>", lambda _: self._schedule_redraw())
+
+    @staticmethod
+    def _validate_int(proposed: str) -> bool:
+        if proposed in ("", "-"):
+            return True
+        try:
+            int(proposed)
+        except ValueError:
+            return False
+        return True
 
     def _bind_updates(self):
-        vars_to_watch = [
-            self.front_var,
-            self.up_var,
-            self.left_var,
-            self.flip_var,
-            self.turn4_var,
-            self.turn5_var,
-            self.turn6_var,
-        ]
-        for var in vars_to_watch:
-            var.trace_add("write", lambda *_: self.redraw())
-        self.canvas.bind("<Configure>", lambda _: self.redraw())
+        for var in (self.front_var, self.up_var, self.left_var, self.flip_var):
+            var.trace_add("write", lambda *_: self._schedule_redraw())
+        self.canvas.bind("<Configure>", lambda _: self._schedule_redraw())
+
+    def _schedule_redraw(self):
+        # Coalesce bursts of variable writes into one redraw per event loop turn.
+        if self._syncing or self._redraw_pending:
+            return
+        self._redraw_pending = True
+        self.root.after_idle(self._do_redraw)
+
+    def _do_redraw(self):
+        self._redraw_pending = False
+        self.redraw()
 
     @staticmethod
     def _safe_int(var: tk.IntVar, default: int = 0) -> int:
@@ -195,17 +354,20 @@ class App:
         except (tk.TclError, ValueError):
             return default
 
+    def _current_key(self) -> tuple[int, int, int, int, int, int, int]:
+        try:
+            f, u, l, fl, t4, t5, t6 = (var.get() for var in self._config_vars)
+        except (tk.TclError, ValueError):
+            # A half-typed Spinbox value: keep the last good value for that field.
+            f, u, l, fl, t4, t5, t6 = (
+                self._safe_int(var, last) for var, last in zip(self._config_vars, self._last_key)
+            )
+        key = (1 if f else 0, 1 if u else 0, 1 if l else 0, 1 if fl else 0, t4, t5, t6)
+        self._last_key = key
+        return key
+
     def current_config(self) -> FanucConfig:
-        cfg = FanucConfig(
-            front=1 if self._safe_int(self.front_var, DEFAULT_FRONT) else 0,
-            up=1 if self._safe_int(self.up_var, DEFAULT_UP) else 0,
-            left=1 if self._safe_int(self.left_var, DEFAULT_LEFT) else 0,
-            flip=1 if self._safe_int(self.flip_var, DEFAULT_FLIP) else 0,
-            turn4=self._safe_int(self.turn4_var, DEFAULT_TURN4),
-            turn5=self._safe_int(self.turn5_var, DEFAULT_TURN5),
-            turn6=self._safe_int(self.turn6_var, DEFAULT_TURN6),
-        ).clamp()
-        return cfg
+        return FanucConfig(*self._current_key())
 
     def _apply_config_to_ui(self, cfg: FanucConfig):
         self._syncing = True
@@ -222,204 +384,280 @@ class App:
         self.redraw()
 
     def reset_defaults(self):
-        self._apply_config_to_ui(FanucConfig().clamp())
+        self._apply_config_to_ui(FanucConfig())
         self.status_var.set("Reset to defaults.")
 
     def load_latest(self):
-        path = Path(self.path_var.get().strip() or DEFAULT_JSONL_PATH)
-        cfg = _read_latest_config_from_jsonl(path)
+        path = self._jsonl_path
+        cfg = self._read_latest_cached(path)
         if cfg is None:
             self.status_var.set(f"No valid Configuration found in {path}")
             return
         self._apply_config_to_ui(cfg)
         self.status_var.set(f"Loaded latest Configuration from {path}")
 
+    def _update_jsonl_path(self):
+        self._jsonl_path = Path(self.path_var.get().strip() or DEFAULT_JSONL_PATH)
+
+    def _read_latest_cached(self, path: Path) -> FanucConfig | None:
+        try:
+            st = path.stat()
+        except OSError:
+            self._jsonl_cache = None
+            return None
+
+        cache = self._jsonl_cache
+        if cache is not None and cache[0] == path:
+            _, mtime_ns, size, resume, cached_cfg = cache
+            if (st.st_mtime_ns, st.st_size) == (mtime_ns, size):
+                return cached_cfg
+            if st.st_size > size:
+                # Appended since the last load: only bytes after the last complete line
+                # can hold a newer record.
+                cfg, resume = _read_latest_config_from_jsonl(path, start=resume)
+                cfg = cfg or cached_cfg
+                self._jsonl_cache = (path, st.st_mtime_ns, st.st_size, resume, cfg)
+                return cfg
+
+        cfg, resume = _read_latest_config_from_jsonl(path)
+        self._jsonl_cache = (path, st.st_mtime_ns, st.st_size, resume, cfg)
+        return cfg
+
     def redraw(self):
         if self._syncing:
             return
-        cfg = self.current_config()
-        self.config_json_var.set(json.dumps(cfg.as_rmi_configuration(), indent=2))
-        self.summary_var.set(
-            "Shoulder: {front}\nElbow: {up}\nArm side: {left}\nWrist style: {flip}\n"
-            "Turn offsets: J4 {t4:+d}, J5 {t5:+d}, J6 {t6:+d}".format(
-                front="front" if cfg.front else "back",
-                up="up" if cfg.up else "down",
-                left="lefty" if cfg.left else "righty",
-                flip="flip" if cfg.flip else "non-flip",
-                t4=cfg.turn4,
-                t5=cfg.turn5,
-                t6=cfg.turn6,
-            )
-        )
+        key = self._current_key()
+        if key == self._drawn_key and self._canvas_size() == self._last_size:
+            return
+        self._drawn_key = key
+        cfg = FanucConfig(*key)
+        self.config_json_var.set(_render_rmi_json(key))
+        self.summary_var.set(_render_summary(key))
         self._draw_scene(cfg)
 
-    def _draw_scene(self, cfg: FanucConfig):
+    def _canvas_size(self) -> tuple[int, int]:
+        return max(700, self.canvas.winfo_width()), max(420, self.canvas.winfo_height())
+
+    def _create_scene_items(self):
+        # Items are created once and only moved/reconfigured on redraw.
         c = self.canvas
-        c.delete("all")
+        items = self._items
 
-        w = max(700, c.winfo_width())
-        h = max(420, c.winfo_height())
-        panel_w = min(390, max(320, int(w * 0.34)))
-        panel_x1 = w - panel_w - 18
-        panel_x2 = w - 18
+        # Background grid: one GRID_SPACING tile, tiled into a canvas-sized image on layout.
+        self._grid_tile = tk.PhotoImage(width=GRID_SPACING, height=GRID_SPACING)
+        self._grid_tile.put(GRID_COLOR, to=(0, 0, GRID_SPACING, 1))
+        self._grid_tile.put(GRID_COLOR, to=(0, 0, 1, GRID_SPACING))
+        self._grid_img: tk.PhotoImage | None = None
+        items["grid"] = c.create_image(0, 0, anchor="nw")
 
-        # Background grid
-        for x in range(0, w, 40):
-            c.create_line(x, 0, x, h, fill="#e2e8f0")
-        for y in range(0, h, 40):
-            c.create_line(0, y, w, y, fill="#e2e8f0")
+        items["front_axis"] = c.create_line(0, 0, 0, 0, width=3, fill="#1d4ed8", arrow=tk.LAST)
+        items["front_axis_label"] = c.create_text(0, 0, text="Front axis (+)", fill="#1d4ed8", anchor="w")
+        items["down_axis"] = c.create_line(0, 0, 0, 0, width=3, fill="#9333ea", arrow=tk.LAST)
+        items["down_axis_label"] = c.create_text(0, 0, text="Down", fill="#9333ea", anchor="w")
 
-        # Drawing area center (left side of help panel)
-        draw_left = 140
-        draw_right = max(draw_left + 420, panel_x1 - 24)
-        cx = int((draw_left + draw_right) * 0.5)
-        cy = int(h * 0.48)
+        # Robot links
+        for name, width, color in [
+            ("link_base", 14, "#334155"),
+            ("link_upper", 12, "#0f766e"),
+            ("link_fore", 10, "#b45309"),
+            ("link_tool", 8, "#dc2626"),
+        ]:
+            items[name] = c.create_line(0, 0, 0, 0, width=width, fill=color, capstyle=tk.ROUND)
 
-        # Branch directions
-        front_dir = 1 if cfg.front else -1
-        up_dir = -1 if cfg.up else 1
-        side_dir = -1 if cfg.left else 1
-        flip_dir = 1 if cfg.flip else -1
+        # Joints
+        for name, color in [
+            ("joint_base", "#0f172a"),
+            ("joint_shoulder", "#1e293b"),
+            ("joint_elbow", "#1e293b"),
+            ("joint_wrist", "#1e293b"),
+        ]:
+            items[name] = c.create_oval(0, 0, 0, 0, fill=color, outline="")
 
-        base = (cx, cy + 120)
-        shoulder = (cx + side_dir * 70, cy + 30)
-        elbow = (shoulder[0] + front_dir * 160, shoulder[1] + up_dir * 90)
-        wrist = (elbow[0] + front_dir * 130, elbow[1] + up_dir * 45)
-        tool = (wrist[0] + flip_dir * 60, wrist[1] - up_dir * 20)
+        items["tool_tip"] = c.create_polygon(0, 0, 0, 0, 0, 0, fill="#111827", outline="")
 
-        # Axes indicators
-        c.create_line(40, 60, 130, 60, width=3, fill="#1d4ed8", arrow=tk.LAST)
-        c.create_text(40, 44, text="Front axis (+)", fill="#1d4ed8", anchor="w")
-        c.create_line(40, 90, 40, 150, width=3, fill="#9333ea", arrow=tk.LAST)
-        c.create_text(48, 154, text="Down", fill="#9333ea", anchor="w")
+        for name, text in [
+            ("label_base", "Base"),
+            ("label_shoulder", "Shoulder"),
+            ("label_elbow", "Elbow"),
+            ("label_wrist", "Wrist"),
+        ]:
+            items[name] = c.create_text(0, 0, text=text, fill="#0f172a")
 
-        # Robot links
-        c.create_line(*base, *shoulder, width=14, fill="#334155", capstyle=tk.ROUND)
-        c.create_line(*shoulder, *elbow, width=12, fill="#0f766e", capstyle=tk.ROUND)
-        c.create_line(*elbow, *wrist, width=10, fill="#b45309", capstyle=tk.ROUND)
-        c.create_line(*wrist, *tool, width=8, fill="#dc2626", capstyle=tk.ROUND)
+        for name in ("Turn4", "Turn5", "Turn6"):
+            self._create_turn_gauge(name)
 
-        # Joints
-        for x, y, r, color in [
-            (base[0], base[1], 11, "#0f172a"),
-            (shoulder[0], shoulder[1], 10, "#1e293b"),
-            (elbow[0], elbow[1], 9, "#1e293b"),
-            (wrist[0], wrist[1], 8, "#1e293b"),
+        items["title"] = c.create_text(
+            0,
+            0,
+            text="Live branch sketch (conceptual, not IK-accurate)",
+            fill="#0f172a",
+            font=("TkDefaultFont", 10, "bold"),
+        )
+
+        self._create_help_panel()
+
+    def _draw_scene(self, cfg: FanucConfig):
+        c = self.canvas
+
+        w, h = self._canvas_size()
+        if (w, h) != self._last_size:
+            self._layout(w, h)
+            self._last_size = (w, h)
+
+        cx, cy = self._center
+        base, shoulder, elbow, wrist, tool = _arm_points(cx, cy, cfg.front, cfg.up, cfg.left, cfg.flip)
+        front_dir = 1 if cfg.front else -1
+
+        items = self._items
+        c.coords(items["link_base"], *base, *shoulder)
+        c.coords(items["link_upper"], *shoulder, *elbow)
+        c.coords(items["link_fore"], *elbow, *wrist)
+        c.coords(items["link_tool"], *wrist, *tool)
+
+        for name, (x, y), r in [
+            ("joint_base", base, 11),
+            ("joint_shoulder", shoulder, 10),
+            ("joint_elbow", elbow, 9),
+            ("joint_wrist", wrist, 8),
         ]:
-            c.create_oval(x - r, y - r, x + r, y + r, fill=color, outline="")
+            c.coords(items[name], x - r, y - r, x + r, y + r)
 
-        c.create_polygon(
+        c.coords(
+            items["tool_tip"],
             tool[0],
             tool[1],
             tool[0] - 16 * front_dir,
             tool[1] - 8,
             tool[0] - 16 * front_dir,
             tool[1] + 8,
-            fill="#111827",
-            outline="",
         )
 
-        c.create_text(base[0], base[1] + 22, text="Base", fill="#0f172a")
-        c.create_text(shoulder[0], shoulder[1] - 18, text="Shoulder", fill="#0f172a")
-        c.create_text(elbow[0], elbow[1] - 18, text="Elbow", fill="#0f172a")
-        c.create_text(wrist[0], wrist[1] - 18, text="Wrist", fill="#0f172a")
+        c.coords(items["label_base"], base[0], base[1] + 22)
+        c.coords(items["label_shoulder"], shoulder[0], shoulder[1] - 18)
+        c.coords(items["label_elbow"], elbow[0], elbow[1] - 18)
+        c.coords(items["label_wrist"], wrist[0], wrist[1] - 18)
+
+        self._update_turn_gauge("Turn4", cfg.turn4)
+        self._update_turn_gauge("Turn5", cfg.turn5)
+        self._update_turn_gauge("Turn6", cfg.turn6)
+
+        self._update_help_panel(cfg)
+
+    def _layout(self, w: int, h: int):
+        c = self.canvas
+        items = self._items
+
+        panel_w = min(390, max(320, int(w * 0.34)))
+        panel_x1 = w - panel_w - 18
+        panel_x2 = w - 18
+
+        # Background grid (photo copy with a -to region larger than the source tiles it)
+        self._grid_img = tk.PhotoImage(width=w, height=h)
+        self._grid_img.tk.call(self._grid_img, "copy", self._grid_tile, "-to", 0, 0, w, h)
+        c.itemconfig(items["grid"], image=self._grid_img)
+
+        # Drawing area center (left side of help panel)
+        draw_left = 140
+        draw_right = max(draw_left + 420, panel_x1 - 24)
+        self._center = (int((draw_left + draw_right) * 0.5), int(h * 0.48))
+
+        # Axes indicators
+        c.coords(items["front_axis"], 40, 60, 130, 60)
+        c.coords(items["front_axis_label"], 40, 44)
+        c.coords(items["down_axis"], 40, 90, 40, 150)
+        c.coords(items["down_axis_label"], 48, 154)
 
         # Turn gauges
         gx = int(w * 0.16)
         gy = int(h * 0.30)
-        self._draw_turn_gauge(gx, gy, "Turn4", cfg.turn4)
-        self._draw_turn_gauge(gx, gy + 150, "Turn5", cfg.turn5)
-        self._draw_turn_gauge(gx, gy + 300, "Turn6", cfg.turn6)
+        self._layout_turn_gauge("Turn4", gx, gy)
+        self._layout_turn_gauge("Turn5", gx, gy + 150)
+        self._layout_turn_gauge("Turn6", gx, gy + 300)
 
-        c.create_text(
-            int((draw_left + draw_right) * 0.5),
-            24,
-            text="Live branch sketch (conceptual, not IK-accurate)",
-            fill="#0f172a",
-            font=("TkDefaultFont", 10, "bold"),
-        )
+        c.coords(items["title"], int((draw_left + draw_right) * 0.5), 24)
 
-        self._draw_help_panel(cfg, panel_x1, 20, panel_x2, h - 20)
+        self._layout_help_panel(panel_x1, 20, panel_x2, h - 20)
 
-    def _draw_turn_gauge(self, x: int, y: int, name: str, turns: int):
+    def _create_turn_gauge(self, name: str):
         c = self.canvas
-        color = "#16a34a" if turns >= 0 else "#ea580c"
-        c.create_text(x, y - 38, text=name, fill="#0f172a", font=("TkDefaultFont", 10, "bold"))
-        c.create_oval(x - 20, y - 20, x + 20, y + 20, outline="#475569", width=2, fill="#f8fafc")
+        self._items[f"{name}_name"] = c.create_text(
+            0, 0, text=name, fill="#0f172a", font=("TkDefaultFont", 10, "bold")
+        )
+        self._items[f"{name}_dial"] = c.create_oval(0, 0, 0, 0, outline="#475569", width=2, fill="#f8fafc")
+        self._gauge_arcs[name] = [
+            c.create_arc(0, 0, 0, 0, style=tk.ARC, width=2, state="hidden") for _ in range(MAX_GAUGE_LOOPS)
+        ]
+        self._items[f"{name}_value"] = c.create_text(0, 0, fill="#0f172a")
+        self._items[f"{name}_more"] = c.create_text(0, 0, fill="#64748b")
 
-        loops = min(abs(turns), 8)
-        for i in range(loops):
+    def _layout_turn_gauge(self, name: str, x: int, y: int):
+        c = self.canvas
+        c.coords(self._items[f"{name}_name"], x, y - 38)
+        c.coords(self._items[f"{name}_dial"], x - 20, y - 20, x + 20, y + 20)
+        for i, arc in enumerate(self._gauge_arcs[name]):
             pad = 24 + i * 5
-            start = 15 if turns >= 0 else 200
-            extent = 300 if turns >= 0 else -300
-            c.create_arc(
-                x - pad,
-                y - pad,
-                x + pad,
-                y + pad,
-                start=start,
-                extent=extent,
-                style=tk.ARC,
-                width=2,
-                outline=color,
-            )
-        c.create_text(x, y + 42, text=f"{turns:+d} ({turns * 360:+d} deg)", fill="#0f172a")
-        if abs(turns) > 8:
-            c.create_text(x, y + 58, text=f"... +{abs(turns) - 8} more wraps", fill="#64748b")
+            c.coords(arc, x - pad, y - pad, x + pad, y + pad)
+        c.coords(self._items[f"{name}_value"], x, y + 42)
+        c.coords(self._items[f"{name}_more"], x, y + 58)
 
-    def _draw_help_panel(self, cfg: FanucConfig, x1: int, y1: int, x2: int, y2: int):
+    def _update_turn_gauge(self, name: str, turns: int):
         c = self.canvas
-        c.create_rectangle(x1, y1, x2, y2, fill="#fffdfa", outline="#cbd5e1", width=2)
+        color = "#16a34a" if turns >= 0 else "#ea580c"
+        start = 15 if turns >= 0 else 200
+        extent = 300 if turns >= 0 else -300
+
+        loops = min(abs(turns), MAX_GAUGE_LOOPS)
+        for i, arc in enumerate(self._gauge_arcs[name]):
+            if i < loops:
+                c.itemconfig(arc, start=start, extent=extent, outline=color, state="normal")
+            else:
+                c.itemconfig(arc, state="hidden")
+        c.itemconfig(self._items[f"{name}_value"], text=f"{turns:+d} ({turns * 360:+d} deg)")
+        if abs(turns) > MAX_GAUGE_LOOPS:
+            c.itemconfig(
+                self._items[f"{name}_more"],
+                text=f"... +{abs(turns) - MAX_GAUGE_LOOPS} more wraps",
+                state="normal",
+            )
+        else:
+            c.itemconfig(self._items[f"{name}_more"], state="hidden")
 
-        title_x = x1 + 14
-        c.create_text(
-            title_x,
-            y1 + 14,
+    def _create_help_panel(self):
+        c = self.canvas
+        items = self._items
+        items["help_box"] = c.create_rectangle(0, 0, 0, 0, fill="#fffdfa", outline="#cbd5e1", width=2)
+        items["help_title"] = c.create_text(
+            0,
+            0,
             anchor="nw",
             text="What These Settings Mean (Noob Version)",
             fill="#0f172a",
             font=("TkDefaultFont", 10, "bold"),
         )
+        items["help_state"] = c.create_text(0, 0, anchor="nw", fill="#334155", font=("TkDefaultFont", 9))
+
+        items["help_text"] = c.create_text(
+            0, 0, anchor="nw", text=HELP_TEXT, fill="#1e293b", font=("TkDefaultFont", 9)
+        )
 
+    def _layout_help_panel(self, x1: int, y1: int, x2: int, y2: int):
+        c = self.canvas
+        items = self._items
+        title_x = x1 + 14
+        text_width = max(120, x2 - x1 - 28)
+        c.coords(items["help_box"], x1, y1, x2, y2)
+        c.coords(items["help_title"], title_x, y1 + 14)
+        c.coords(items["help_state"], title_x, y1 + 38)
+        c.itemconfig(items["help_state"], width=text_width)
+        c.coords(items["help_text"], title_x, y1 + 72)
+        c.itemconfig(items["help_text"], width=text_width)
+
+    def _update_help_panel(self, cfg: FanucConfig):
         state_text = (
             f"Current: Front={cfg.front}, Up={cfg.up}, Left={cfg.left}, Flip={cfg.flip}, "
             f"Turns=({cfg.turn4:+d}, {cfg.turn5:+d}, {cfg.turn6:+d})"
         )
-        c.create_text(
-            title_x,
-            y1 + 38,
-            anchor="nw",
-            text=state_text,
-            fill="#334155",
-            font=("TkDefaultFont", 9),
-            width=max(120, x2 - x1 - 28),
-        )
-
-        explainer = (
-            "Front: Picks one shoulder branch for the same XYZWPR target.\n"
-            "1 means front-side branch, 0 means the opposite branch.\n\n"
-            "Up: Picks elbow-up vs elbow-down style posture.\n"
-            "1 = elbow-up, 0 = elbow-down.\n\n"
-            "Left: Picks lefty/righty arm side branch.\n"
-            "1 = lefty style, 0 = righty style.\n\n"
-            "Flip: Picks wrist flip branch.\n"
-            "1 = flip wrist branch, 0 = non-flip branch.\n\n"
-            "Turn4/5/6: Wrist wrap counts for J4/J5/J6.\n"
-            "+1 means one extra full +360 deg turn, -1 means -360 deg.\n"
-            "They keep orientation continuity and cable-friendly wrist posture.\n\n"
-            "Important: Same Cartesian pose can map to multiple joint solutions.\n"
-            "These fields tell FANUC which one to use. Wrong branch can cause\n"
-            "\"position not reachable\" on linear moves."
-        )
-        c.create_text(
-            title_x,
-            y1 + 72,
-            anchor="nw",
-            text=explainer,
-            fill="#1e293b",
-            font=("TkDefaultFont", 9),
-            width=max(120, x2 - x1 - 28),
-        )
+        self.canvas.itemconfig(self._items["help_state"], text=state_text)
 
 
 def main():
@@ -1,53 +1,61 @@
-from .client import RobotClient
-from .connection import SocketJsonReader, connect_with_retry, send_command
-from .motions import (
-    linear_relative,
-    linear_absolute,
-    joint_relative,
-    joint_absolute,
-    joint_absolute_trajectory,
-    speed_override,
-    wait_time,
-    set_uframe,
-    set_utool,
-)
-from .pose_reader import (
-    read_cartesian_coordinates,
-    read_joint_coordinates,
-    get_uframe_utool,
-    set_uframe_utool,
-    read_uframe_data,
-    write_uframe_data,
-    read_utool_data,
-    write_utool_data,
-    read_error,
-    read_din,
-    write_dout,
-)
+import importlib
 
-__all__ = [
-    "RobotClient",
-    "SocketJsonReader",
-    "connect_with_retry",
-    "send_command",
-    "linear_relative",
-    "linear_absolute",
-    "joint_relative",
-    "joint_absolute",
-    "joint_absolute_trajectory"
-    "speed_override",
-    "wait_time",
-    "set_uframe",
-    "set_utool",
-    "read_cartesian_coordinates",
-    "read_joint_coordinates",
-    "get_uframe_utool",
-    "set_uframe_utool",
-    "read_uframe_data",
-    "write_uframe_data",
-    "read_utool_data",
-    "write_utool_data",
-    "read_error",
-    "read_din",
-    "write_dout",
-]
+# Public names are resolved on first access so that importing the package does
+# not pull in numpy and the socket layers until they are actually used.
+_LAZY = {
+    "RobotClient": "client",
+    "FrameCache": "client",
+    "AsyncRobotClient": "async_client",
+    "SocketJsonReader": "connection",
+    "connect_with_retry": "connection",
+    "send_command": "connection",
+    "send_commands": "connection",
+    "send_raw": "connection",
+    "encode_packet": "connection",
+    "linear_relative": "motions",
+    "linear_absolute": "motions",
+    "joint_relative": "motions",
+    "joint_absolute": "motions",
+    "joint_absolute_trajectory": "motions",
+    "make_joint_relative_packet": "motions",
+    "make_joint_absolute_packet": "motions",
+    "joint_trajectory": "motions",
+    "densify_joint_waypoints": "motions",
+    "speed_override": "motions",
+    "wait_time": "motions",
+    "set_uframe": "motions",
+    "set_utool": "motions",
+    "PoseLogger": "pose_reader",
+    "flush_pose_writes": "pose_reader",
+    "read_cartesian_coordinates": "pose_reader",
+    "read_joint_coordinates": "pose_reader",
+    "read_pose_bundle": "pose_reader",
+    "cartesian_array": "pose_reader",
+    "joint_array": "pose_reader",
+    "get_uframe_utool": "pose_reader",
+    "set_uframe_utool": "pose_reader",
+    "read_uframe_data": "pose_reader",
+    "read_uframes_bulk": "pose_reader",
+    "write_uframe_data": "pose_reader",
+    "read_utool_data": "pose_reader",
+    "read_utools_bulk": "pose_reader",
+    "write_utool_data": "pose_reader",
+    "read_error": "pose_reader",
+    "read_din": "pose_reader",
+    "write_dout": "pose_reader",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Optional
+
+from .connection import encode_packet, json_loads
+from .pose_reader import _normalize_frame_data
+
+log = logging.getLogger(__name__)
+
+
+class AsyncRobotClient:
+    """asyncio client for RMI commands that can be awaited concurrently.
+
+    Command replies arrive in the order the commands were written, so each request
+    gets a future queued in write order and the reader task resolves them FIFO.
+    Only commands are exposed here; motion instructions stay on ``RobotClient``.
+    """
+
+    def __init__(self, host: str = "192.168.1.22", startup_port: int = 16001, main_port: int = 16002, connect_timeout: float = 5.0, reader_timeout: float = 60.0, startup_pause: float = 0.25):
+        self.host = host
+        self.startup_port = startup_port
+        self.main_port = main_port
+        self.connect_timeout = connect_timeout
+        self.reader_timeout = reader_timeout
+        self.startup_pause = startup_pause
+
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: deque[asyncio.Future] = deque()
+        # Set once the read loop has stopped; later requests fail with it immediately.
+        self._closed_error: Optional[BaseException] = None
+
+    async def _open(self, port: int):
+        return await asyncio.wait_for(asyncio.open_connection(self.host, port), self.connect_timeout)
+
+    async def connect(self):
+        log.info("- started async rmi client...")
+        reader, writer = await self._open(self.startup_port)
+        writer.write(encode_packet({"Communication": "FRC_Connect"}))
+        await writer.drain()
+        response = json_loads(await asyncio.wait_for(reader.readuntil(b"\r\n"), self.reader_timeout))
+        log.debug("%s", response)
+        if "Port" in response:
+            self.main_port = int(response["Port"])
+        writer.close()
+        await writer.wait_closed()
+
+        await asyncio.sleep(self.startup_pause)  # let the controller bring up the runtime port
+
+        reader, self._writer = await self._open(self.main_port)
+        self._closed_error = None
+        self._reader_task = asyncio.create_task(self._read_loop(reader))
+        log.info("- connected to port %s", self.main_port)
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                line = await reader.readuntil(b"\r\n")
+                if not line.strip():
+                    continue
+                try:
+                    packet = json_loads(line)
+                except ValueError as exc:
+                    # Only commands are sent from here, so the bad line is the oldest
+                    # request's reply; fail that one and keep the rest in step.
+                    log.warning("malformed reply %r: %s", line, exc)
+                    if self._pending:
+                        future = self._pending.popleft()
+                        if not future.done():
+                            future.set_exception(exc)
+                    continue
+                if "Instruction" in packet or not self._pending:
+                    log.debug("unsolicited reply: %s", packet)
+                    continue
+                future = self._pending.popleft()
+                if not future.done():
+                    future.set_result(packet)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError) as exc:
+            if isinstance(exc, asyncio.IncompleteReadError):
+                error = ConnectionError("RMI connection closed")
+            elif isinstance(exc, asyncio.LimitOverrunError):
+                # The stream is no longer at a line boundary, so later replies cannot be framed.
+                error = ConnectionError(f"RMI reply exceeded the stream limit: {exc}")
+            else:
+                error = exc
+            self._closed_error = error
+            while self._pending:
+                future = self._pending.popleft()
+                if not future.done():
+                    future.set_exception(error)
+
+    async def request(self, data: dict) -> dict:
+        """Send one command and await its reply."""
+        if self._writer is None:
+            raise RuntimeError("Client is not connected.")
+        if self._closed_error is not None:
+            raise ConnectionError("RMI connection is closed") from self._closed_error
+        future = asyncio.get_running_loop().create_future()
+        # Queue the future and write in the same step so FIFO order matches write order.
+        self._pending.append(future)
+        self._writer.write(encode_packet(data))
+        await self._writer.drain()
+        response = await asyncio.wait_for(future, self.reader_timeout)
+        log.debug("%s", response)
+        return response
+
+    async def _checked(self, data: dict) -> dict:
+        response = await self.request(data)
+        await self.read_error(response)
+        return response
+
+    async def read_error(self, response_prev_command: dict) -> dict:
+        if int(response_prev_command.get("ErrorID", -1)) == 0:
+            return {}
+        return await self.request({"Command": "FRC_ReadError"})
+
+    async def read_cartesian_coordinates(self) -> dict:
+        return await self._checked({"Command": "FRC_ReadCartesianPosition"})
+
+    async def read_joint_coordinates(self) -> dict:
+        return await self._checked({"Command": "FRC_ReadJointAngles"})
+
+    async def get_uframe_utool(self) -> dict:
+        response = await self._checked({"Command": "FRC_GetUFrameUTool"})
+        return {"UFrameNumber": response.get("UFrameNumber"), "UToolNumber": response.get("UToolNumber")}
+
+    async def read_uframe_data(self, frame_number: int) -> dict:
+        response = await self._checked({"Command": "FRC_ReadUFrameData", "FrameNumber": int(frame_number)})
+        return _normalize_frame_data(response.get("Frame", {}), require_all_keys=False)
+
+    async def read_utool_data(self, tool_number: int) -> dict:
+        response = await self._checked({"Command": "FRC_ReadUToolData", "ToolNumber": int(tool_number)})
+        return _normalize_frame_data(response.get("Frame", {}), require_all_keys=False)
+
+    async def read_din(self, port_number: int) -> dict:
+        return await self._checked({"Command": "FRC_ReadDIN", "PortNumber": int(port_number)})
+
+    async def close(self):
+        if self._writer is None:
+            return
+        try:
+            if self._reader_task is not None and not self._reader_task.done():
+                await self.request({"Communication": "FRC_Disconnect"})
+        finally:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except (OSError, ConnectionError):
+                # The peer is already gone; nothing is left to release.
+                pass
+            if self._reader_task is not None:
+                self._reader_task.cancel()
+            self._writer = None
+            self._reader_task = None
+            log.info("- disconnected from port %s", self.main_port)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            await self.close()
+            return
+        # Best-effort close; an I/O error here must not replace the original exception.
+        try:
+            await self.close()
+        except (OSError, ConnectionError, asyncio.TimeoutError):
+            log.debug("close after %s failed", exc_type.__name__, exc_info=True)
@@ -1,36 +1,89 @@
+import logging
+import socket
 import time
-from typing import Literal
+from pathlib import Path
+from typing import Literal, Optional, Tuple
 import numpy as np
 
-from .connection import SocketJsonReader, connect_with_retry, send_command, read_packet
+from .connection import SocketJsonReader, connect_with_retry, encode_packet, send_command, send_commands, send_raw, read_packet
 from .motions import (
     linear_relative,
     linear_absolute,
     joint_relative,
     joint_absolute,
     joint_absolute_trajectory,
+    joint_trajectory,
     speed_override,
     wait_time,
     set_uframe,
     set_utool,
 )
 from .pose_reader import (
+    DEFAULT_CARTESIAN_PATH,
+    DEFAULT_JOINT_PATH,
+    PoseLogger,
     read_cartesian_coordinates,
     read_joint_coordinates,
+    read_pose_bundle,
     get_uframe_utool,
     set_uframe_utool,
-    read_uframe_data,
     write_uframe_data,
-    read_utool_data,
     write_utool_data,
     read_error,
     read_din,
     write_dout,
+    _read_frame_reply,
+    _read_frames_bulk_replies,
 )
 
+log = logging.getLogger(__name__)
+
+_CONNECT_PACKET = encode_packet({"Communication": "FRC_Connect"})
+_DISCONNECT_PACKET = encode_packet({"Communication": "FRC_Disconnect"})
+_ABORT_PACKET = encode_packet({"Command": "FRC_Abort"})
+# Seconds to wait for the FRC_Disconnect reply when closing after an error.
+_DISCONNECT_TIMEOUT = 1.0
+
+
+def _reply_ok(response: dict) -> bool:
+    return int(response.get("ErrorID", -1)) == 0
+
+
+class FrameCache:
+    """Session cache of user frame / user tool records, keyed by number."""
+
+    def __init__(self):
+        self._frames: dict[int, dict] = {}
+        self._tools: dict[int, dict] = {}
+
+    def get_frame(self, frame_number: int) -> Optional[dict]:
+        frame = self._frames.get(int(frame_number))
+        return None if frame is None else dict(frame)
+
+    def get_tool(self, tool_number: int) -> Optional[dict]:
+        tool = self._tools.get(int(tool_number))
+        return None if tool is None else dict(tool)
+
+    def put_frame(self, frame_number: int, frame: dict):
+        self._frames[int(frame_number)] = dict(frame)
+
+    def put_tool(self, tool_number: int, tool: dict):
+        self._tools[int(tool_number)] = dict(tool)
+
+    def invalidate(self, frame_number: Optional[int] = None, tool_number: Optional[int] = None):
+        """Drop one frame and/or tool entry, or everything when called without arguments."""
+        if frame_number is None and tool_number is None:
+            self._frames.clear()
+            self._tools.clear()
+            return
+        if frame_number is not None:
+            self._frames.pop(int(frame_number), None)
+        if tool_number is not None:
+            self._tools.pop(int(tool_number), None)
+
 
 class RobotClient:
-    def __init__(self, host: str = "192.168.1.22", startup_port: int = 16001, main_port: int = 16002, connect_timeout: float = 5.0, socket_timeout: float = 60.0, reader_timeout: float = 60.0, attempts: int = 5, retry_delay: float = 0.5, startup_pause: float = 0.25):
+    def __init__(self, host: str = "192.168.1.22", startup_port: int = 16001, main_port: int = 16002, connect_timeout: float = 5.0, socket_timeout: float = 60.0, reader_timeout: float = 60.0, attempts: int = 5, retry_delay: float = 0.5, startup_pause: float = 0.25, backoff_cap: float = 8.0):
         self.host = host
         self.startup_port = startup_port
         self.main_port = main_port
@@ -40,12 +93,40 @@ class RobotClient:
         self.attempts = attempts
         self.retry_delay = retry_delay
         self.startup_pause = startup_pause
-
-        self.client_socket = None
-        self.reader = None
+        self.backoff_cap = backoff_cap
+
+        self._conn: Optional[Tuple[socket.socket, SocketJsonReader]] = None
+        self._pose_loggers: dict[Path, PoseLogger] = {}
+        self.frame_cache = FrameCache()
+
+    @property
+    def client_socket(self) -> Optional[socket.socket]:
+        return None if self._conn is None else self._conn[0]
+
+    @property
+    def reader(self) -> Optional[SocketJsonReader]:
+        return None if self._conn is None else self._conn[1]
+
+    def _pose_logger(self, output_path: Path | str) -> PoseLogger:
+        # Key by Path so "./a.jsonl" and Path("a.jsonl") share one open handle.
+        path = output_path if isinstance(output_path, Path) else Path(output_path)
+        logger = self._pose_loggers.get(path)
+        if logger is None:
+            logger = self._pose_loggers[path] = PoseLogger(path)
+        return logger
+
+    def flush_pose_logs(self):
+        for logger in self._pose_loggers.values():
+            logger.flush()
+
+    def _need(self) -> Tuple[socket.socket, SocketJsonReader]:
+        conn = self._conn
+        if conn is None:
+            raise RuntimeError("Client socket or reader is not connected.")
+        return conn
 
     def connect(self):
-        print("- started rmi client...")
+        log.info("- started rmi client...")
 
         startup_socket = connect_with_retry(
             self.host,
@@ -54,53 +135,55 @@ class RobotClient:
             delay=self.retry_delay,
             connect_timeout=self.connect_timeout,
             socket_timeout=self.socket_timeout,
+            backoff_cap=self.backoff_cap,
         )
         startup_reader = SocketJsonReader(startup_socket, timeout=self.reader_timeout)
-        print(f"- connected to startup port {self.startup_port}")
+        log.info("- connected to startup port %s", self.startup_port)
 
-        send_command(startup_socket, {"Communication": "FRC_Connect"})
+        send_raw(startup_socket, _CONNECT_PACKET)
         response = read_packet(startup_reader)
-        print(response)
+        log.debug("%s", response)
 
         if "Port" in response:
             self.main_port = int(response["Port"])
 
         startup_socket.close()
-        print(f"- disconnected from startup port {self.startup_port}")
+        log.info("- disconnected from startup port %s", self.startup_port)
 
         time.sleep(self.startup_pause)  # brief pause to let the controller finish spinning up the next port
 
-        self.client_socket = connect_with_retry(
+        client_socket = connect_with_retry(
             self.host,
             self.main_port,
             attempts=self.attempts,
             delay=self.retry_delay,
             connect_timeout=self.connect_timeout,
             socket_timeout=self.socket_timeout,
+            backoff_cap=self.backoff_cap,
         )
-        self.reader = SocketJsonReader(self.client_socket, timeout=self.reader_timeout)
-        print(f"- connected to port {self.main_port}")
+        self._conn = (client_socket, SocketJsonReader(client_socket, timeout=self.reader_timeout))
+        self.frame_cache.invalidate()
+        log.info("- connected to port %s", self.main_port)
 
     def initialize(self, uframe: int = 0, utool: int = 1):
+        sock, reader = self._need()
         commands = [
             {"Command": "FRC_Reset"},
             {"Command": "FRC_Initialize"},
+            {"Command": "FRC_SetUFrameUTool", "UFrameNumber": int(uframe), "UToolNumber": int(utool)},
         ]
 
-        for command in commands:
-            if self.client_socket is None or self.reader is None:
-                raise RuntimeError("Client socket or reader is not connected.")
-            send_command(self.client_socket, command)
-            response = read_packet(self.reader)
-            print(response)
-        self.set_uframe_utool(uframe=uframe, utool=utool)
+        # Pipelined: one write for all startup commands, then one response per command.
+        responses = send_commands(sock, reader, commands)
+        for response in responses:
+            log.debug("%s", response)
+        read_error(sock, reader, responses[-1])
 
     def linear_relative(self, relative_displacement: dict, speed: float, sequence_id: int = 1, uframe: int = 0, utool: int = 1):
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
+        sock, reader = self._need()
         linear_relative(
-            self.client_socket,
-            self.reader,
+            sock,
+            reader,
             relative_displacement,
             speed,
             sequence_id,
@@ -109,11 +192,10 @@ class RobotClient:
         )
 
     def linear_absolute(self, absolute_position: dict, speed: float, sequence_id: int = 1, uframe: int = 0, utool: int = 1):
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
+        sock, reader = self._need()
         linear_absolute(
-            self.client_socket,
-            self.reader,
+            sock,
+            reader,
             absolute_position,
             speed,
             sequence_id,
@@ -122,134 +204,243 @@ class RobotClient:
         )
 
     def joint_relative(self, relative_displacement: dict, speed_percentage: float, sequence_id: int = 1, term_type: Literal["FINE", "CNT"] = "FINE", term_value: int = 100):
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
+        sock, reader = self._need()
         joint_relative(
-            self.client_socket,
-            self.reader,
+            sock,
+            reader,
             relative_displacement,
             speed_percentage,
             sequence_id,
         )
 
     def joint_absolute(self, absolute_position: dict, speed_percentage: float, sequence_id: int = 1, term_type: Literal["FINE", "CNT"] = "FINE", term_value: int = 100):
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
+        sock, reader = self._need()
         joint_absolute(
-            self.client_socket,
-            self.reader,
+            sock,
+            reader,
             absolute_position,
             speed_percentage,
             sequence_id,
         )
 
     def joint_absolute_trajectory(self, qs: np.ndarray, speed_percentage: float, start_sequence_id: int = 1, term_value: int = 100):
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
+        sock, reader = self._need()
         joint_absolute_trajectory(
-            self.client_socket,
-            self.reader,
+            sock,
+            reader,
             qs,
             speed_percentage,
             start_sequence_id,
             term_value,
         )
 
-    def speed_override(self, value: int):
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        speed_override(self.client_socket, self.reader, value)
+    def joint_trajectory(self, waypoints, speed_percentage: float, max_step: float = 2.0, start_sequence_id: int = 1, term_value: int = 100):
+        sock, reader = self._need()
+        return joint_trajectory(
+            sock,
+            reader,
+            waypoints,
+            speed_percentage,
+            max_step=max_step,
+            start_sequence_id=start_sequence_id,
+            term_value=term_value,
+        )
 
-    def wait_time(self, seconds: float, sequence_id: int = 1):
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        wait_time(self.client_socket, self.reader, seconds, sequence_id)
+    def enqueue(self, packet: dict):
+        """Send an instruction packet without waiting for its reply.
+
+        At most MAX_RMI_BUFFER instructions are left unanswered on the controller;
+        beyond that this blocks until one completes. Replies are returned
+        by ``drain``. The SequenceID must not belong to another unanswered instruction.
+        """
+        if "Instruction" not in packet:
+            raise ValueError("enqueue() only accepts instruction packets")
+        sock, reader = self._need()
+        sequence_id = packet.get("SequenceID")
+        reader.wait_for_slot(sequence_id)
+        send_command(sock, packet)
+        # Registered only once the packet is out, so a failed send leaves nothing to wait for.
+        reader.await_reply(packet["Instruction"], sequence_id)
+
+    def drain(self) -> list[dict]:
+        """Wait for every enqueued instruction and return their replies in arrival order."""
+        if self._conn is None:
+            return []
+        reader = self._conn[1]
+        while reader.outstanding:
+            reader.wait_awaited()
+        responses = list(reader.completed)
+        reader.completed.clear()
+        for response in responses:
+            log.debug("%s", response)
+            read_error(self._conn[0], reader, response)
+        return responses
+
+    def speed_override(self, value: int, no_wait: bool = False):
+        sock, reader = self._need()
+        speed_override(sock, reader, value, no_wait=no_wait)
+
+    def wait_time(self, seconds: float, sequence_id: int = 1, no_wait: bool = False):
+        sock, reader = self._need()
+        wait_time(sock, reader, seconds, sequence_id, no_wait=no_wait)
 
     def set_uframe(self, frame_number: int, sequence_id: int = 1) -> dict:
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        return set_uframe(self.client_socket, self.reader, frame_number, sequence_id)
+        sock, reader = self._need()
+        return set_uframe(sock, reader, frame_number, sequence_id)
 
     def set_utool(self, tool_number: int, sequence_id: int = 1) -> dict:
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        return set_utool(self.client_socket, self.reader, tool_number, sequence_id)
+        sock, reader = self._need()
+        return set_utool(sock, reader, tool_number, sequence_id)
 
     def abort(self):
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        send_command(self.client_socket, {"Command": "FRC_Abort"})
-        response = read_packet(self.reader)
-        print(response)
+        sock, reader = self._need()
+        send_raw(sock, _ABORT_PACKET)
+        response = read_packet(reader)
+        log.debug("%s", response)
         return response
 
-    def read_cartesian_coordinates(self, output_path: str = "./robot_position_cartesian.jsonl"):
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        return read_cartesian_coordinates(self.client_socket, self.reader, output_path=output_path)
-
-    def read_joint_coordinates(self, output_path: str = "./robot_position_joint.jsonl"):
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        return read_joint_coordinates(self.client_socket, self.reader, output_path=output_path)
+    def read_cartesian_coordinates(self, output_path: Path | str = DEFAULT_CARTESIAN_PATH, persist: bool = True):
+        sock, reader = self._need()
+        logger = self._pose_logger(output_path) if persist else None
+        return read_cartesian_coordinates(sock, reader, output_path=output_path, logger=logger, persist=persist)
+
+    def read_joint_coordinates(self, output_path: Path | str = DEFAULT_JOINT_PATH, persist: bool = True):
+        sock, reader = self._need()
+        logger = self._pose_logger(output_path) if persist else None
+        return read_joint_coordinates(sock, reader, output_path=output_path, logger=logger, persist=persist)
+
+    def read_pose_bundle(self, cartesian_path: Path | str = DEFAULT_CARTESIAN_PATH, joint_path: Path | str = DEFAULT_JOINT_PATH, persist: bool = True) -> Tuple[dict, dict]:
+        sock, reader = self._need()
+        return read_pose_bundle(
+            sock,
+            reader,
+            cartesian_path,
+            joint_path,
+            cartesian_logger=self._pose_logger(cartesian_path) if persist else None,
+            joint_logger=self._pose_logger(joint_path) if persist else None,
+            persist=persist,
+        )
 
     def get_uframe_utool(self) -> dict:
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        return get_uframe_utool(self.client_socket, self.reader)
+        sock, reader = self._need()
+        return get_uframe_utool(sock, reader)
 
     def set_uframe_utool(self, uframe: int, utool: int) -> dict:
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        return set_uframe_utool(self.client_socket, self.reader, uframe, utool)
+        sock, reader = self._need()
+        return set_uframe_utool(sock, reader, uframe, utool)
 
+    # Frame/tool records rarely change during a session, so reads are served from
+    # frame_cache after the first fetch; writes through this client invalidate the entry.
+    # Only replies with ErrorID 0 are cached, so a failed read is retried next time.
     def read_uframe_data(self, frame_number: int) -> dict:
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        return read_uframe_data(self.client_socket, self.reader, frame_number)
+        sock, reader = self._need()
+        frame = self.frame_cache.get_frame(frame_number)
+        if frame is not None:
+            return frame
+        frame, response = _read_frame_reply(sock, reader, "FRC_ReadUFrameData", "FrameNumber", frame_number)
+        if _reply_ok(response):
+            self.frame_cache.put_frame(frame_number, frame)
+        return frame
+
+    def read_uframes_bulk(self, frame_numbers=range(1, 10)) -> dict:
+        sock, reader = self._need()
+        frame_numbers = [int(number) for number in frame_numbers]
+        frames = {number: self.frame_cache.get_frame(number) for number in frame_numbers}
+        missing = [number for number, frame in frames.items() if frame is None]
+        if missing:
+            for number, (frame, response) in _read_frames_bulk_replies(sock, reader, "FRC_ReadUFrameData", "FrameNumber", missing).items():
+                if _reply_ok(response):
+                    self.frame_cache.put_frame(number, frame)
+                frames[number] = frame
+        return frames
 
     def write_uframe_data(self, frame_number: int, frame: dict) -> dict:
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        return write_uframe_data(self.client_socket, self.reader, frame_number, frame)
+        sock, reader = self._need()
+        self.frame_cache.invalidate(frame_number=frame_number)
+        return write_uframe_data(sock, reader, frame_number, frame)
 
     def read_utool_data(self, tool_number: int) -> dict:
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        return read_utool_data(self.client_socket, self.reader, tool_number)
+        sock, reader = self._need()
+        tool = self.frame_cache.get_tool(tool_number)
+        if tool is not None:
+            return tool
+        tool, response = _read_frame_reply(sock, reader, "FRC_ReadUToolData", "ToolNumber", tool_number)
+        if _reply_ok(response):
+            self.frame_cache.put_tool(tool_number, tool)
+        return tool
+
+    def read_utools_bulk(self, tool_numbers=range(1, 10)) -> dict:
+        sock, reader = self._need()
+        tool_numbers = [int(number) for number in tool_numbers]
+        tools = {number: self.frame_cache.get_tool(number) for number in tool_numbers}
+        missing = [number for number, tool in tools.items() if tool is None]
+        if missing:
+            for number, (tool, response) in _read_frames_bulk_replies(sock, reader, "FRC_ReadUToolData", "ToolNumber", missing).items():
+                if _reply_ok(response):
+                    self.frame_cache.put_tool(number, tool)
+                tools[number] = tool
+        return tools
 
     def write_utool_data(self, tool_number: int, frame: dict) -> dict:
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        return write_utool_data(self.client_socket, self.reader, tool_number, frame)
+        sock, reader = self._need()
+        self.frame_cache.invalidate(tool_number=tool_number)
+        return write_utool_data(sock, reader, tool_number, frame)
 
     def read_error(self, response_prev_command) -> dict:
-        if self.client_socket is None or self.reader is None or response_prev_command is None:
+        if self._conn is None or response_prev_command is None:
             # Return an empty dict to satisfy the return type
             return {}
-        result = read_error(self.client_socket, self.reader, response_prev_command)
+        sock, reader = self._conn
+        result = read_error(sock, reader, response_prev_command)
         if result is None:
             return {}
         return result
 
     def read_din(self, port_number: int) -> dict:
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        return read_din(self.client_socket, self.reader, port_number)
+        sock, reader = self._need()
+        return read_din(sock, reader, port_number)
 
     def write_dout(self, port_number: int, port_value: str | bool) -> dict:
-        if self.client_socket is None or self.reader is None:
-            raise RuntimeError("Client socket or reader is not connected.")
-        return write_dout(self.client_socket, self.reader, port_number, port_value)
-
-    def close(self):
-        if self.client_socket and self.reader:
-            send_command(self.client_socket, {"Communication": "FRC_Disconnect"})
-            response = read_packet(self.reader)
-            print(response)
-
-            self.client_socket.close()
-            print(f"- disconnected from port {self.main_port}")
-
-            self.client_socket = None
-            self.reader = None
+        sock, reader = self._need()
+        return write_dout(sock, reader, port_number, port_value)
+
+    def __enter__(self):
+        if self._conn is None:
+            self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return
+        # After an error the connection may be in any state: skip the drain, still say
+        # goodbye if the socket allows it, and never raise over the original exception.
+        try:
+            self.close(drain=False)
+        except (OSError, ValueError):
+            log.debug("disconnect after %s failed", exc_type.__name__, exc_info=True)
+
+    def close(self, drain: bool = True):
+        for logger in self._pose_loggers.values():
+            logger.close()
+        self._pose_loggers.clear()
+
+        if self._conn is not None:
+            sock, reader = self._conn
+            try:
+                if drain:
+                    self.drain()
+                else:
+                    sock.settimeout(_DISCONNECT_TIMEOUT)
+                send_raw(sock, _DISCONNECT_PACKET)
+                response = read_packet(reader)
+                # Without a drain, replies to earlier packets may still be ahead of it.
+                while "Communication" not in response:
+                    response = read_packet(reader)
+                log.debug("%s", response)
+            finally:
+                sock.close()
+                self._conn = None
+                # Frames may be edited on the pendant between sessions.
+                self.frame_cache.invalidate()
+                log.info("- disconnected from port %s", self.main_port)
@@ -1,45 +1,215 @@
 import json
+import logging
+import random
 import socket
 import time
+from collections import Counter, deque
 from typing import Optional
 
 MAX_RMI_BUFFER = 8
 
+log = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # optional "fast" extra
+    orjson = None
+
+if orjson is not None:
+    def json_dumps(obj) -> bytes:
+        """Serialize ``obj`` to compact JSON bytes."""
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    json_loads = orjson.loads
+else:
+    # One configured encoder, reused instead of rebuilding it on every json.dumps call.
+    _encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=True)
+
+    def json_dumps(obj) -> bytes:
+        """Serialize ``obj`` to compact JSON bytes."""
+        return _encoder.encode(obj).encode("ascii")
+
+    json_loads = json.loads
+
+_NO_PACKET = object()
+
 class SocketJsonReader:
     """Accumulate bytes from the socket until a CRLF-terminated JSON message arrives."""
 
+    RECV_SIZE = 4096
+
     def __init__(self, sock: socket.socket, timeout: float = 15.0):
         self.sock = sock
-        self.buffer = bytearray()
+        # Received bytes live in buffer[start:end]; recv_into writes straight after end.
+        self.buffer = bytearray(2 * self.RECV_SIZE)
+        self.start = 0
+        self.end = 0
+        self.scan_start = 0  # bytes before this offset are known not to start a CRLF
+        # Replies that were sent without waiting, keyed by Command name or by
+        # (Instruction, SequenceID); they are consumed by whichever read encounters them.
+        self.deferred = Counter()
+        # Instruction replies for packets sent with enqueue-style pipelining, as
+        # {SequenceID: Instruction}. Any read that meets one moves it to ``completed``
+        # instead of returning it.
+        self.awaiting: dict[int, str] = {}
+        self.completed = deque()
+        # Other packets that arrived while wait_awaited was receiving; read_json returns
+        # these first.
+        self.unclaimed = deque()
         self.sock.settimeout(timeout)
 
+    def defer_reply(self, name: str, sequence_id: Optional[int] = None):
+        """Expect one reply for ``name`` that read_json should skip instead of returning.
+
+        Pass ``sequence_id`` for instructions; they hold a controller buffer slot until
+        the reply arrives.
+        """
+        self.deferred[name if sequence_id is None else (name, sequence_id)] += 1
+
+    def await_reply(self, instruction: str, sequence_id: int):
+        """Expect one ``instruction`` reply for ``sequence_id`` and collect it into ``completed``."""
+        if sequence_id in self.awaiting:
+            raise ValueError(f"SequenceID {sequence_id} is already awaiting a reply")
+        self.awaiting[sequence_id] = instruction
+
+    @property
+    def outstanding(self) -> int:
+        """Instructions sent without waiting (awaited or deferred) that are still unanswered."""
+        return len(self.awaiting) + sum(count for key, count in self.deferred.items() if type(key) is tuple)
+
+    def wait_for_slot(self, sequence_id: Optional[int] = None):
+        """Block until another instruction fits in the controller's MAX_RMI_BUFFER slots."""
+        if sequence_id is not None and sequence_id in self.awaiting:
+            raise ValueError(f"SequenceID {sequence_id} is already awaiting a reply")
+        while self.outstanding >= MAX_RMI_BUFFER:
+            self.wait_awaited()
+
+    def wait_awaited(self):
+        """Receive until at least one more unanswered instruction has been answered."""
+        if not self.outstanding:
+            return
+        target = self.outstanding - 1
+        while True:
+            packet = self._next_buffered()
+            if packet is not _NO_PACKET:
+                self.unclaimed.append(packet)
+            elif self.outstanding > target:
+                self._recv()
+            else:
+                return
+
     def read_json(self):
+        if self.unclaimed:
+            return self.unclaimed.popleft()
         while True:
-            newline_index = self._find_newline()
-            if newline_index != -1:
-                raw = bytes(self.buffer[:newline_index])
-                del self.buffer[: newline_index + 2]  # remove CRLF
-                raw_str = raw.decode("ascii").strip()
-                if not raw_str:
-                    continue
-                return json.loads(raw_str)
-            chunk = self.sock.recv(4096)
-            if not chunk:
-                raise ConnectionError("Robot controller closed the connection unexpectedly")
-            self.buffer.extend(chunk)
-
-    def _find_newline(self) -> int:
-        buf = self.buffer
-        for i in range(len(buf) - 1):
-            if buf[i] == 13 and buf[i + 1] == 10:  # CRLF
-                return i
-        return -1
+            packet = self._next_buffered()
+            if packet is not _NO_PACKET:
+                return packet
+            self._recv()
+
+    def _recv(self):
+        self._reserve(self.RECV_SIZE)
+        with memoryview(self.buffer) as view:
+            received = self.sock.recv_into(view[self.end :])
+        if not received:
+            raise ConnectionError("Robot controller closed the connection unexpectedly")
+        self.end += received
+
+    def read_all_available(self, limit: Optional[int] = None) -> list:
+        """Return every complete message already buffered (at most ``limit``) without receiving."""
+        out = []
+        while self.unclaimed and (limit is None or len(out) < limit):
+            out.append(self.unclaimed.popleft())
+        while limit is None or len(out) < limit:
+            packet = self._next_buffered()
+            if packet is _NO_PACKET:
+                break
+            out.append(packet)
+        return out
+
+    def _next_buffered(self):
+        while True:
+            newline_index = self.buffer.find(b"\r\n", self.scan_start, self.end)
+            if newline_index == -1:
+                # Keep the last byte in range: it may be the CR of a CRLF split across recvs.
+                self.scan_start = max(self.start, self.end - 1)
+                return _NO_PACKET
+            raw = bytes(self.buffer[self.start : newline_index]).strip()
+            self.start = self.scan_start = newline_index + 2  # skip CRLF
+            if self.start == self.end:
+                self.start = self.end = self.scan_start = 0
+            if not raw:
+                continue
+            packet = json_loads(raw)
+            # Awaited replies match on name and SequenceID, so check them before deferred ones.
+            if self.awaiting and self._collect_awaited(packet):
+                continue
+            if self.deferred and self._consume_deferred(packet):
+                continue
+            return packet
+
+    def _consume_deferred(self, packet: dict) -> bool:
+        name = packet.get("Command")
+        key = name if name is not None else (packet.get("Instruction"), packet.get("SequenceID"))
+        if not self.deferred.get(key):
+            return False
+        self.deferred[key] -= 1
+        if not self.deferred[key]:
+            del self.deferred[key]
+        if int(packet.get("ErrorID", 0)) != 0:
+            # Nobody waits on this reply, so the error would otherwise go unnoticed.
+            log.warning("deferred reply failed: %s", packet)
+        else:
+            log.debug("deferred reply: %s", packet)
+        return True
+
+    def _collect_awaited(self, packet: dict) -> bool:
+        instruction = packet.get("Instruction")
+        if instruction is None or self.awaiting.get(packet.get("SequenceID")) != instruction:
+            return False
+        del self.awaiting[packet["SequenceID"]]
+        self.completed.append(packet)
+        return True
+
+    def _reserve(self, size: int):
+        """Make room for at least ``size`` more bytes after ``end``."""
+        if len(self.buffer) - self.end >= size:
+            return
+        if self.start:
+            # Compact unread bytes to the front; same-length slice assignment does not resize.
+            pending = self.end - self.start
+            self.buffer[:pending] = self.buffer[self.start : self.end]
+            self.scan_start -= self.start
+            self.start, self.end = 0, pending
+        while len(self.buffer) - self.end < size:
+            self.buffer.extend(bytes(len(self.buffer)))
+
+
+def encode_packet(data: dict) -> bytes:
+    """Serialize one packet as compact JSON with the CRLF terminator."""
+    return json_dumps(data) + b"\r\n"
 
 
 def send_command(client_socket: socket.socket, data: dict):
     """Send a command to the robot and return the response."""
-    json_data = json.dumps(data) + "\r\n"
-    client_socket.sendall(json_data.encode("ascii"))
+    client_socket.sendall(encode_packet(data))
+
+
+def send_raw(client_socket: socket.socket, payload: bytes):
+    """Send an already-encoded packet (see ``encode_packet``) as-is."""
+    client_socket.sendall(payload)
+
+
+def send_commands(client_socket: socket.socket, reader: SocketJsonReader, commands: list[dict]) -> list[dict]:
+    """Send several commands in one write and return their responses in order."""
+    payload = b"".join(encode_packet(data) for data in commands)
+    client_socket.sendall(payload)
+    responses = []
+    while len(responses) < len(commands):
+        responses.append(reader.read_json())
+        # Replies often arrive together; take the rest of this recv without another pass.
+        responses.extend(reader.read_all_available(limit=len(commands) - len(responses)))
+    return responses
 
 
 def read_packet(reader: SocketJsonReader):
@@ -47,17 +217,32 @@ def read_packet(reader: SocketJsonReader):
     return reader.read_json()
 
 
-def connect_with_retry(host: str, port: int, attempts: int = 5, delay: float = 0.5, connect_timeout: float = 5.0, socket_timeout: float = 5.0) -> socket.socket:
-    """Retry connecting to the controller to avoid racing its startup."""
+def connect_with_retry(host: str, port: int, attempts: int = 5, delay: float = 0.5, connect_timeout: float = 5.0, socket_timeout: float = 5.0, backoff_cap: float = 8.0, buffer_size: Optional[int] = 1 << 18) -> socket.socket:
+    """Retry connecting to the controller to avoid racing its startup.
+
+    Waits between attempts use full-jitter exponential backoff: a random delay in
+    ``[0, min(backoff_cap, delay * 2**(attempt - 1))]``.
+
+    Sockets are returned with TCP_NODELAY and SO_KEEPALIVE set; ``buffer_size``
+    sets SO_SNDBUF/SO_RCVBUF (``None`` keeps the OS defaults).
+    """
     last_error: Optional[Exception] = None
     for attempt in range(1, attempts + 1):
         try:
             sock = socket.create_connection((host, port), timeout=connect_timeout)
             sock.settimeout(socket_timeout)
+            # RMI traffic is small request/response packets; don't let Nagle hold them back.
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # The session stays open for the whole program; notice a vanished controller.
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            if buffer_size:
+                # Room for a full window of pipelined packets/replies without stalling.
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, buffer_size)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, buffer_size)
             return sock
         except OSError as exc:
             last_error = exc
             if attempt < attempts:
-                time.sleep(delay)
+                time.sleep(random.uniform(0, min(backoff_cap, delay * 2 ** (attempt - 1))))
     raise RuntimeError(f"Unable to connect to {host}:{port} after {attempts} attempts") from last_error
 
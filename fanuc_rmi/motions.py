@@ -1,10 +1,71 @@
 from fanuc_rmi.connection import MAX_RMI_BUFFER
 
-from .connection import SocketJsonReader, send_command, read_packet
+from .connection import SocketJsonReader, json_dumps, send_command, send_raw, read_packet
 
+from types import MappingProxyType
 from typing import Literal
 import numpy as np
 from collections import deque
+import logging
+
+log = logging.getLogger(__name__)
+
+JOINT_KEYS = tuple(f"J{i}" for i in range(1, 10))
+
+# Arm configuration sent with every linear motion. Read-only so callers cannot
+# change the flags baked into the templates below.
+CONFIGURATION_DEFAULT = MappingProxyType({"Front": 1, "Up": 1, "Left": 0, "Flip": 0, "Turn4": 0, "Turn5": 0, "Turn6": 0})
+
+# Encoded once, without the surrounding braces, so the frame/tool numbers can precede it.
+_CONFIGURATION_FLAGS = json_dumps(dict(CONFIGURATION_DEFAULT))[1:-1]
+
+
+class _MotionTemplate:
+    """Pre-serialized motion instruction packet.
+
+    The constant parts (instruction name, ``Configuration`` flags, speed type) are
+    encoded once; ``render`` only formats the per-call fields into the bytes template.
+    """
+
+    __slots__ = ("instruction", "with_configuration", "template")
+
+    def __init__(self, instruction: str, payload_key: str, speed_type: str, with_configuration: bool):
+        self.instruction = instruction
+        self.with_configuration = with_configuration
+        configuration = (
+            b'"Configuration":{"UToolNumber":%d,"UFrameNumber":%d,' + _CONFIGURATION_FLAGS + b"},"
+            if with_configuration
+            else b""
+        )
+        self.template = (
+            b'{"Instruction":"' + instruction.encode("ascii") + b'","SequenceID":%d,'
+            + configuration
+            + b'"' + payload_key.encode("ascii") + b'":%b,'
+            + b'"SpeedType":"' + speed_type.encode("ascii") + b'","Speed":%b,"TermType":"%b","TermValue":%d}\r\n'
+        )
+
+    def render(
+        self,
+        sequence_id: int,
+        payload: dict,
+        speed: float,
+        term_type: str = "FINE",
+        term_value: int = 100,
+        uframe: int = 1,
+        utool: int = 1,
+    ) -> bytes:
+        """Return the CRLF-terminated packet bytes for one motion."""
+        tail = (json_dumps(payload), json_dumps(speed), term_type.encode("ascii"), int(term_value))
+        if self.with_configuration:
+            return self.template % (int(sequence_id), int(utool), int(uframe), *tail)
+        return self.template % (int(sequence_id), *tail)
+
+
+_LINEAR_RELATIVE = _MotionTemplate("FRC_LinearRelative", "Position", "mmSec", with_configuration=True)
+_LINEAR_ABSOLUTE = _MotionTemplate("FRC_LinearMotion", "Position", "mmSec", with_configuration=True)
+_JOINT_RELATIVE = _MotionTemplate("FRC_JointRelativeJRep", "JointAngle", "Percent", with_configuration=False)
+_JOINT_ABSOLUTE = _MotionTemplate("FRC_JointMotionJRep", "JointAngle", "Percent", with_configuration=False)
+
 
 def linear_relative(
     client_socket,
@@ -18,32 +79,14 @@ def linear_relative(
     term_value: int = 100,
 ):
     """Send a linear relative motion command and return the response (blocking)."""
-    
-    data = {
-        "Instruction": "FRC_LinearRelative",
-        "SequenceID": sequence_id,
-        "Configuration": {
-            "UToolNumber": int(utool),
-            "UFrameNumber": int(uframe),
-            "Front": 1,
-            "Up": 1,
-            "Left": 0,
-            "Flip": 0,
-            "Turn4": 0,
-            "Turn5": 0,
-            "Turn6": 0,
-        },
-        "Position": relative_displacement,
-        "SpeedType": "mmSec",
-        "Speed": speed,
-        "TermType": term_type,
-        "TermValue": term_value
-    }
-    send_command(client_socket, data)
+
+    payload = _LINEAR_RELATIVE.render(sequence_id, relative_displacement, speed, term_type, term_value, uframe=uframe, utool=utool)
+    reader.wait_for_slot(sequence_id)
+    send_raw(client_socket, payload)
     response = read_packet(reader)
-    print(response)
-    
-    
+    log.debug("%s", response)
+
+
 def linear_absolute(
     client_socket,
     reader: SocketJsonReader,
@@ -56,30 +99,12 @@ def linear_absolute(
     term_value: int = 100,
 ):
     """Send a linear absolute motion command and return the response (blocking)."""
-    
-    data = {
-        "Instruction": "FRC_LinearMotion",
-        "SequenceID": sequence_id,
-        "Configuration": {
-            "UToolNumber": int(utool),
-            "UFrameNumber": int(uframe),
-            "Front": 1,
-            "Up": 1,
-            "Left": 0,
-            "Flip": 0,
-            "Turn4": 0,
-            "Turn5": 0,
-            "Turn6": 0,
-        },
-        "Position": absolute_position,
-        "SpeedType": "mmSec",
-        "Speed": speed,
-        "TermType": term_type,
-        "TermValue": term_value
-    }
-    send_command(client_socket, data)
+
+    payload = _LINEAR_ABSOLUTE.render(sequence_id, absolute_position, speed, term_type, term_value, uframe=uframe, utool=utool)
+    reader.wait_for_slot(sequence_id)
+    send_raw(client_socket, payload)
     response = read_packet(reader)
-    print(response)
+    log.debug("%s", response)
 
 def make_joint_relative_packet(
     relative_displacement: dict,
@@ -112,17 +137,11 @@ def joint_relative(
 ):
     """Send a joint relative motion command and return the response (blocking)."""
 
-    data = make_joint_relative_packet(
-        relative_displacement,
-        speed_percentage,
-        sequence_id,
-        term_type,
-        term_value,
-    )
-
-    send_command(client_socket, data)
+    payload = _JOINT_RELATIVE.render(sequence_id, relative_displacement, speed_percentage, term_type, term_value)
+    reader.wait_for_slot(sequence_id)
+    send_raw(client_socket, payload)
     response = read_packet(reader)
-    print(response)
+    log.debug("%s", response)
 
 
 def make_joint_absolute_packet(
@@ -156,17 +175,11 @@ def joint_absolute(
 ):
     """Send a joint absolute motion command and return the response (blocking)."""
 
-    data = make_joint_absolute_packet(
-        absolute_position,
-        speed_percentage,
-        sequence_id,
-        term_type,
-        term_value,
-    )
-    
-    send_command(client_socket, data)
+    payload = _JOINT_ABSOLUTE.render(sequence_id, absolute_position, speed_percentage, term_type, term_value)
+    reader.wait_for_slot(sequence_id)
+    send_raw(client_socket, payload)
     response = read_packet(reader)
-    print(response)
+    log.debug("%s", response)
 
 def joint_absolute_trajectory(
     client_socket,
@@ -200,6 +213,9 @@ def joint_absolute_trajectory(
         The list of responses from the robot.
     """
     n = qs.shape[0]
+    joint_keys = JOINT_KEYS[: qs.shape[1]]
+    if reader.awaiting and any(start_sequence_id + i in reader.awaiting for i in range(n)):
+        raise ValueError("Trajectory SequenceIDs overlap instructions that are still enqueued")
 
     outstanding = deque()
     next_to_send = 0
@@ -207,24 +223,29 @@ def joint_absolute_trajectory(
 
     def send_one(i: int):
         term_type: Literal["FINE", "CNT"] = "FINE" if i == n - 1 else "CNT"
-        packet = make_joint_absolute_packet(
-            absolute_position={f"J{j+1}": qs[next_to_send, j] for j in range(qs.shape[1])},
-            speed_percentage=speed_percentage,
-            sequence_id=start_sequence_id + next_to_send,
-            term_type=term_type,
-            term_value=term_value,
+        packet = _JOINT_ABSOLUTE.render(
+            start_sequence_id + i,
+            # tolist() yields plain Python floats, so the encoder never sees numpy scalars.
+            dict(zip(joint_keys, qs[i].tolist())),
+            speed_percentage,
+            term_type,
+            term_value,
         )
-        send_command(client_socket, packet)
+        send_raw(client_socket, packet)
         outstanding.append(i + 1)
 
-    # Fill buffer with first few coordinates
-    initial_fill = min(MAX_RMI_BUFFER, n)
-    for _ in range(initial_fill):
-        send_one(next_to_send)
-        next_to_send += 1
+    # Keep the controller buffer full; instructions the reader is still waiting on
+    # (RobotClient.enqueue, no_wait calls) occupy slots too.
+    while next_to_send < n or outstanding:
+        if next_to_send < n and len(outstanding) + reader.outstanding < MAX_RMI_BUFFER:
+            send_one(next_to_send)
+            next_to_send += 1
+            continue
+        if not outstanding:
+            # Only the reader's instructions hold the buffer; wait for one of them.
+            reader.wait_awaited()
+            continue
 
-    # For each completed instruction, send a new one
-    while outstanding:
         response = read_packet(reader)
         responses.append(response)
 
@@ -232,29 +253,113 @@ def joint_absolute_trajectory(
         if returned_seq is not None:
             outstanding.popleft()
 
-        if next_to_send < n:
-            send_one(next_to_send)
-            next_to_send += 1
-
     return responses
 
 
-def speed_override(client_socket, reader: SocketJsonReader, value: int):
-    """Set the speed override percentage."""
+def _max_hermite_speed(p0, p1, m0, m1) -> float:
+    # The derivative of a cubic Hermite segment is a quadratic a*t^2 + b*t + c per joint;
+    # its largest magnitude on [0, 1] is at an end point or at the vertex.
+    a = 6 * p0 + 3 * m0 - 6 * p1 + 3 * m1
+    b = -6 * p0 - 4 * m0 + 6 * p1 - 2 * m1
+    c = m0
+    candidates = [np.abs(c), np.abs(a + b + c)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.clip(np.where(a != 0, -b / (2 * a), 0.0), 0.0, 1.0)
+    candidates.append(np.abs(a * t * t + b * t + c))
+    return float(np.max(candidates))
+
+
+def densify_joint_waypoints(waypoints, max_step: float = 2.0) -> np.ndarray:
+    """
+    Interpolate joint waypoints with a cubic Hermite spline so no joint moves more
+    than ``max_step`` degrees between consecutive points.
+
+    Interior tangents are Catmull-Rom (central differences); the path starts and ends
+    at rest. Every input waypoint is kept, so the result passes through all of them.
+
+    Parameters
+    ----------
+    waypoints: array-like of shape (n_points, n_joints)
+        The joint positions to pass through, in degrees.
+    max_step: float
+        Largest per-joint change between two output points, in degrees.
+
+    Returns
+    -------
+    np.ndarray of shape (n_out, n_joints)
+    """
+    points = np.asarray(waypoints, dtype=float)
+    if points.ndim != 2:
+        raise ValueError("waypoints must have shape (n_points, n_joints)")
+    if max_step <= 0:
+        raise ValueError("max_step must be positive")
+    if points.shape[0] < 2:
+        return points.copy()
+
+    tangents = np.zeros_like(points)
+    tangents[1:-1] = (points[2:] - points[:-2]) / 2.0
+
+    segments = [points[:1]]
+    for i in range(points.shape[0] - 1):
+        p0, p1, m0, m1 = points[i], points[i + 1], tangents[i], tangents[i + 1]
+        steps = max(1, int(np.ceil(_max_hermite_speed(p0, p1, m0, m1) / max_step)))
+        t = (np.arange(1, steps + 1) / steps)[:, None]
+        t2, t3 = t * t, t * t * t
+        segments.append(
+            (2 * t3 - 3 * t2 + 1) * p0
+            + (t3 - 2 * t2 + t) * m0
+            + (-2 * t3 + 3 * t2) * p1
+            + (t3 - t2) * m1
+        )
+    return np.concatenate(segments)
+
+
+def joint_trajectory(
+    client_socket,
+    reader: SocketJsonReader,
+    waypoints,
+    speed_percentage: float,
+    max_step: float = 2.0,
+    start_sequence_id: int = 1,
+    term_value: int = 100,
+) -> list[dict]:
+    """Densify joint waypoints (dicts with J1..Jn, or an array) and stream them via joint_absolute_trajectory."""
+    if len(waypoints) and isinstance(waypoints[0], dict):
+        keys = JOINT_KEYS[: len(waypoints[0])]
+        waypoints = [[waypoint[key] for key in keys] for waypoint in waypoints]
+    qs = densify_joint_waypoints(waypoints, max_step=max_step)
+    return joint_absolute_trajectory(client_socket, reader, qs, speed_percentage, start_sequence_id, term_value)
+
+
+def speed_override(client_socket, reader: SocketJsonReader, value: int, no_wait: bool = False):
+    """Set the speed override percentage.
+
+    With ``no_wait=True`` the acknowledgement is not awaited; it is consumed by the next read.
+    """
 
     data = {"Command": "FRC_SetOverRide", "Value": value}
     send_command(client_socket, data)
+    if no_wait:
+        reader.defer_reply("FRC_SetOverRide")
+        return
     response = read_packet(reader)
-    print(response)
+    log.debug("%s", response)
 
 
-def wait_time(client_socket, reader: SocketJsonReader, seconds: float, sequence_id: int = 1):
-    """Wait for the specified number of seconds."""
+def wait_time(client_socket, reader: SocketJsonReader, seconds: float, sequence_id: int = 1, no_wait: bool = False):
+    """Wait for the specified number of seconds.
+
+    With ``no_wait=True`` the instruction response is not awaited; it is consumed by the next read.
+    """
 
     data = {"Instruction": "FRC_WaitTime", "SequenceID": sequence_id, "Time": seconds}
+    reader.wait_for_slot(sequence_id)
     send_command(client_socket, data)
+    if no_wait:
+        reader.defer_reply("FRC_WaitTime", sequence_id)
+        return
     response = read_packet(reader)
-    print(response)
+    log.debug("%s", response)
 
 
 def set_uframe(client_socket, reader: SocketJsonReader, frame_number: int, sequence_id: int = 1):
@@ -264,9 +369,10 @@ def set_uframe(client_socket, reader: SocketJsonReader, frame_number: int, seque
         "SequenceID": int(sequence_id),
         "FrameNumber": int(frame_number),
     }
+    reader.wait_for_slot(data["SequenceID"])
     send_command(client_socket, data)
     response = read_packet(reader)
-    print(response)
+    log.debug("%s", response)
     return response
 
 
@@ -277,7 +383,8 @@ def set_utool(client_socket, reader: SocketJsonReader, tool_number: int, sequenc
         "SequenceID": int(sequence_id),
         "ToolNumber": int(tool_number),
     }
+    reader.wait_for_slot(data["SequenceID"])
     send_command(client_socket, data)
     response = read_packet(reader)
-    print(response)
+    log.debug("%s", response)
     return response
@@ -1,72 +1,232 @@
-import json
+import atexit
+import logging
+import queue
+import threading
+from functools import lru_cache
 from pathlib import Path
-from .connection import SocketJsonReader, send_command, read_packet
+
+import numpy as np
+
+from .connection import SocketJsonReader, encode_packet, json_dumps, send_command, send_commands, send_raw, read_packet
+from .motions import JOINT_KEYS
+
+log = logging.getLogger(__name__)
 
 FRAME_KEYS = ("X", "Y", "Z", "W", "P", "R")
+_FRAME_KEYS_SET = frozenset(FRAME_KEYS)
+
+DEFAULT_CARTESIAN_PATH = Path("./robot_position_cartesian.jsonl")
+DEFAULT_JOINT_PATH = Path("./robot_position_joint.jsonl")
+
+# Parameterless commands, encoded once.
+_READ_CARTESIAN_PACKET = encode_packet({"Command": "FRC_ReadCartesianPosition"})
+_READ_JOINT_PACKET = encode_packet({"Command": "FRC_ReadJointAngles"})
+_GET_UFRAME_UTOOL_PACKET = encode_packet({"Command": "FRC_GetUFrameUTool"})
+_READ_ERROR_PACKET = encode_packet({"Command": "FRC_ReadError"})
 
 
 def _normalize_frame_data(frame: dict, *, require_all_keys: bool) -> dict:
     if not isinstance(frame, dict):
         raise TypeError(f"Frame must be a dict, got {type(frame).__name__}")
 
-    missing = [key for key in FRAME_KEYS if key not in frame]
-    if require_all_keys and missing:
-        missing_txt = ", ".join(missing)
+    if require_all_keys and not _FRAME_KEYS_SET.issubset(frame):
+        # Only build the list when validation fails; keep FRAME_KEYS order for the message.
+        missing_txt = ", ".join(key for key in FRAME_KEYS if key not in frame)
         raise ValueError(f"Frame is missing required keys: {missing_txt}")
 
-    return {key: float(frame.get(key, 0.0)) for key in FRAME_KEYS}
+    # Controller replies usually carry exactly X/Y/Z/W/P/R as floats already.
+    if len(frame) == len(FRAME_KEYS) and _FRAME_KEYS_SET.issubset(frame) and all(type(value) is float for value in frame.values()):
+        return frame
+
+    get = frame.get
+    return {
+        "X": float(get("X", 0.0)),
+        "Y": float(get("Y", 0.0)),
+        "Z": float(get("Z", 0.0)),
+        "W": float(get("W", 0.0)),
+        "P": float(get("P", 0.0)),
+        "R": float(get("R", 0.0)),
+    }
 
 
-def read_cartesian_coordinates(client_socket, reader: SocketJsonReader, output_path: str = "./robot_position_cartesian.jsonl"):
-    """Send a command to read the robot's Cartesian position and return full packet."""
-    data = {"Command": "FRC_ReadCartesianPosition"}
-    send_command(client_socket, data)
-    response = read_packet(reader)
+def _as_path(output_path: Path | str) -> Path:
+    return output_path if isinstance(output_path, Path) else Path(output_path)
 
-    print(response)
-    read_error(client_socket, reader, response)
 
-    path = Path(output_path)
+@lru_cache(maxsize=128)
+def _ensure_path(output_path: Path) -> Path:
+    # Create the parent directory and file once per path; the file is assumed to
+    # stay in place between calls.
+    path = output_path
     path.parent.mkdir(parents=True, exist_ok=True)
     path.touch(exist_ok=True)
+    return path
+
+
+class PoseLogger:
+    """Append-only JSONL writer that keeps its file open across calls."""
+
+    def __init__(self, output_path: Path | str):
+        self.path = _ensure_path(_as_path(output_path))
+        self._file = self.path.open("ab")
+
+    def log(self, response: dict):
+        # One pre-built line, one write; orjson produces bytes directly when installed.
+        # Flushed per record so readers of the JSONL (e.g. the visualizer) see it at once.
+        self._file.write(json_dumps(response) + b"\n")
+        self._file.flush()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Appends without an explicit PoseLogger are handed to one background thread, so
+# the caller returns as soon as the packet is parsed. Items are (path, line) pairs,
+# or (None, event) to request a flush.
+_WRITE_Q: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+_writer_thread: threading.Thread | None = None
+_writer_lock = threading.Lock()
+
+
+def _writer_loop():
+    files = {}
+    while True:
+        path, item = _WRITE_Q.get()
+        if path is None:
+            for file in files.values():
+                file.flush()
+            if item is None:
+                for file in files.values():
+                    file.close()
+                return
+            item.set()
+            continue
+        try:
+            file = files.get(path)
+            if file is None:
+                file = files[path] = _ensure_path(path).open("ab")
+            file.write(item)
+            if _WRITE_Q.empty():
+                file.flush()
+        except OSError:
+            log.exception("Failed to append pose packet to %s", path)
+
+
+def _start_writer():
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(target=_writer_loop, name="fanuc_rmi-pose-writer", daemon=True)
+            _writer_thread.start()
+            atexit.register(_stop_writer)
+
+
+def _stop_writer():
+    # Drain the queue and close the files before the interpreter exits.
+    if _writer_thread is not None and _writer_thread.is_alive():
+        _WRITE_Q.put((None, None))
+        _writer_thread.join()
+
+
+def flush_pose_writes(timeout: float | None = None) -> bool:
+    """Block until queued pose appends are on disk; returns False on timeout."""
+    if _writer_thread is None:
+        return True
+    done = threading.Event()
+    _WRITE_Q.put((None, done))
+    return done.wait(timeout)
+
+
+def _append_packet(output_path: Path | str, response: dict, logger: PoseLogger | None):
+    if logger is not None:
+        logger.log(response)
+        return
+
+    if _writer_thread is None:
+        _start_writer()
+    _WRITE_Q.put((_as_path(output_path), json_dumps(response) + b"\n"))
+
+
+def _read_pose(client_socket, reader: SocketJsonReader, packet: bytes, payload_keys: tuple, label: str, output_path: Path | str, logger: PoseLogger | None, persist: bool):
+    send_raw(client_socket, packet)
+    response = read_packet(reader)
+    log.debug("%s", response)
+    read_error(client_socket, reader, response)
 
-    # Write the full returned packet as one untouched JSON line.
-    with path.open("a", encoding="utf-8") as file:
-        file.write(json.dumps(response, ensure_ascii=True, sort_keys=False) + "\n")
+    if persist:
+        _append_packet(output_path, response, logger)
 
-    position = response.get("Position", {})
-    if not position:
-        print("No position data available.")
+    if not any(response.get(key) for key in payload_keys):
+        log.info("No %s data available.", label)
     return response
 
-def read_joint_coordinates(client_socket, reader: SocketJsonReader, output_path: str = "./robot_position_joint.jsonl"):
-    """Send a command to read the robot's joint angles and return full packet."""
-    data = {"Command": "FRC_ReadJointAngles"}
-    send_command(client_socket, data)
-    response = read_packet(reader)
-    print(response)
-    read_error(client_socket, reader, response)
 
-    path = Path(output_path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.touch(exist_ok=True)
+def read_cartesian_coordinates(client_socket, reader: SocketJsonReader, output_path: Path | str = DEFAULT_CARTESIAN_PATH, logger: PoseLogger | None = None, persist: bool = True):
+    """Send a command to read the robot's Cartesian position and return full packet."""
+    return _read_pose(client_socket, reader, _READ_CARTESIAN_PACKET, ("Position",), "position", output_path, logger, persist)
 
-    # Write the full returned packet as one untouched JSON line.
-    with path.open("a", encoding="utf-8") as file:
-        file.write(json.dumps(response, ensure_ascii=True, sort_keys=False) + "\n")
 
-    joints = response.get("JointAngle") or response.get("Joints") or {}
-    if not joints:
-        print("No joint data available.")
-    return response
+def read_joint_coordinates(client_socket, reader: SocketJsonReader, output_path: Path | str = DEFAULT_JOINT_PATH, logger: PoseLogger | None = None, persist: bool = True):
+    """Send a command to read the robot's joint angles and return full packet."""
+    return _read_pose(client_socket, reader, _READ_JOINT_PACKET, ("JointAngle", "Joints"), "joint", output_path, logger, persist)
+
+
+def read_pose_bundle(
+    client_socket,
+    reader: SocketJsonReader,
+    cartesian_path: Path | str = DEFAULT_CARTESIAN_PATH,
+    joint_path: Path | str = DEFAULT_JOINT_PATH,
+    cartesian_logger: PoseLogger | None = None,
+    joint_logger: PoseLogger | None = None,
+    persist: bool = True,
+) -> tuple[dict, dict]:
+    """Read Cartesian position and joint angles in one pipelined write; returns (cartesian, joints)."""
+    send_raw(client_socket, _READ_CARTESIAN_PACKET + _READ_JOINT_PACKET)
+    cartesian = read_packet(reader)
+    joints = read_packet(reader)
+
+    for response, output_path, logger in ((cartesian, cartesian_path, cartesian_logger), (joints, joint_path, joint_logger)):
+        log.debug("%s", response)
+        read_error(client_socket, reader, response)
+        if persist:
+            _append_packet(output_path, response, logger)
+    return cartesian, joints
+
+
+def cartesian_array(packet: dict) -> np.ndarray:
+    """Return X/Y/Z/W/P/R from a FRC_ReadCartesianPosition packet as a float array of shape (6,)."""
+    position = packet.get("Position", {})
+    return np.array([position.get(key, 0.0) for key in FRAME_KEYS], dtype=float)
+
+
+def joint_array(packet: dict, n_joints: int | None = None) -> np.ndarray:
+    """Return J1..Jn from a FRC_ReadJointAngles packet as a float array.
+
+    Without ``n_joints`` the array stops at the first joint missing from the packet.
+    """
+    joints = packet.get("JointAngle") or packet.get("Joints") or {}
+    if n_joints is None:
+        n_joints = 0
+        while n_joints < len(JOINT_KEYS) and JOINT_KEYS[n_joints] in joints:
+            n_joints += 1
+    return np.array([joints.get(key, 0.0) for key in JOINT_KEYS[:n_joints]], dtype=float)
 
 
 def get_uframe_utool(client_socket, reader: SocketJsonReader) -> dict:
     """Read the controller's currently active user frame/tool numbers."""
-    data = {"Command": "FRC_GetUFrameUTool"}
-    send_command(client_socket, data)
+    send_raw(client_socket, _GET_UFRAME_UTOOL_PACKET)
     response = read_packet(reader)
-    print(response)
+    log.debug("%s", response)
     read_error(client_socket, reader, response)
 
     uframe = response.get("UFrameNumber")
@@ -83,21 +243,47 @@ def set_uframe_utool(client_socket, reader: SocketJsonReader, uframe_number: int
     }
     send_command(client_socket, data)
     response = read_packet(reader)
-    print(response)
+    log.debug("%s", response)
     read_error(client_socket, reader, response)
 
     return {"UFrameNumber": int(uframe_number),"UToolNumber": int(utool_number)}
 
 
-def read_uframe_data(client_socket, reader: SocketJsonReader, frame_number: int) -> dict:
-    """Read FANUC user frame data and return X/Y/Z/W/P/R."""
-    data = {"Command": "FRC_ReadUFrameData", "FrameNumber": frame_number}
-    send_command(client_socket, data)
+def _read_frame_reply(client_socket, reader: SocketJsonReader, command: str, number_key: str, number: int) -> tuple[dict, dict]:
+    # Returns (normalized frame, raw reply) so callers can check ErrorID; a failed read
+    # normalizes to all zeros.
+    send_command(client_socket, {"Command": command, number_key: number})
     response = read_packet(reader)
-    print(response)
+    log.debug("%s", response)
     read_error(client_socket, reader, response)
 
-    return _normalize_frame_data(response.get("Frame", {}), require_all_keys=False)
+    return _normalize_frame_data(response.get("Frame", {}), require_all_keys=False), response
+
+
+def read_uframe_data(client_socket, reader: SocketJsonReader, frame_number: int) -> dict:
+    """Read FANUC user frame data and return X/Y/Z/W/P/R."""
+    return _read_frame_reply(client_socket, reader, "FRC_ReadUFrameData", "FrameNumber", frame_number)[0]
+
+
+def _read_frames_bulk_replies(client_socket, reader: SocketJsonReader, command: str, number_key: str, numbers) -> dict:
+    # {number: (normalized frame, raw reply)}
+    numbers = [int(number) for number in numbers]
+    commands = [{"Command": command, number_key: number} for number in numbers]
+    responses = send_commands(client_socket, reader, commands)
+
+    replies = {}
+    for number, response in zip(numbers, responses):
+        log.debug("%s", response)
+        read_error(client_socket, reader, response)
+        frame = _normalize_frame_data(response.get("Frame", {}), require_all_keys=False)
+        replies[int(response.get(number_key, number))] = (frame, response)
+    return replies
+
+
+def read_uframes_bulk(client_socket, reader: SocketJsonReader, frame_numbers=range(1, 10)) -> dict:
+    """Read several user frames in one pipelined write; returns {frame_number: X/Y/Z/W/P/R}."""
+    replies = _read_frames_bulk_replies(client_socket, reader, "FRC_ReadUFrameData", "FrameNumber", frame_numbers)
+    return {number: frame for number, (frame, _) in replies.items()}
 
 
 def write_uframe_data(client_socket, reader: SocketJsonReader, frame_number: int, frame: dict) -> dict:
@@ -111,7 +297,7 @@ def write_uframe_data(client_socket, reader: SocketJsonReader, frame_number: int
     }
     send_command(client_socket, data)
     response = read_packet(reader)
-    print(response)
+    log.debug("%s", response)
     read_error(client_socket, reader, response)
 
     return response
@@ -119,13 +305,13 @@ def write_uframe_data(client_socket, reader: SocketJsonReader, frame_number: int
 
 def read_utool_data(client_socket, reader: SocketJsonReader, tool_number: int) -> dict:
     """Read FANUC user tool data and return X/Y/Z/W/P/R."""
-    data = {"Command": "FRC_ReadUToolData", "ToolNumber": tool_number}
-    send_command(client_socket, data)
-    response = read_packet(reader)
-    print(response)
-    read_error(client_socket, reader, response)
+    return _read_frame_reply(client_socket, reader, "FRC_ReadUToolData", "ToolNumber", tool_number)[0]
 
-    return _normalize_frame_data(response.get("Frame", {}), require_all_keys=False)
+
+def read_utools_bulk(client_socket, reader: SocketJsonReader, tool_numbers=range(1, 10)) -> dict:
+    """Read several user tools in one pipelined write; returns {tool_number: X/Y/Z/W/P/R}."""
+    replies = _read_frames_bulk_replies(client_socket, reader, "FRC_ReadUToolData", "ToolNumber", tool_numbers)
+    return {number: frame for number, (frame, _) in replies.items()}
 
 
 def write_utool_data(client_socket, reader: SocketJsonReader, tool_number: int, frame: dict) -> dict:
@@ -139,7 +325,7 @@ def write_utool_data(client_socket, reader: SocketJsonReader, tool_number: int,
     }
     send_command(client_socket, data)
     response = read_packet(reader)
-    print(response)
+    log.debug("%s", response)
     read_error(client_socket, reader, response)
     return response
 
@@ -150,10 +336,9 @@ def read_error(client_socket, reader: SocketJsonReader, response_prev_command):
     if error_id == 0:
         return None
 
-    data = {"Command": "FRC_ReadError"}
-    send_command(client_socket, data)
+    send_raw(client_socket, _READ_ERROR_PACKET)
     response_read_error = read_packet(reader)
-    print(response_read_error)
+    log.debug("%s", response_read_error)
     return response_read_error
 
 
@@ -165,7 +350,7 @@ def read_din(client_socket, reader: SocketJsonReader, port_number: int) -> dict:
     }
     send_command(client_socket, data)
     response = read_packet(reader)
-    print(response)
+    log.debug("%s", response)
     read_error(client_socket, reader, response)
     return response
 
@@ -187,7 +372,7 @@ def write_dout(client_socket, reader: SocketJsonReader, port_number: int, port_v
     }
     send_command(client_socket, data)
     response = read_packet(reader)
-    print(response)
+    log.debug("%s", response)
     read_error(client_socket, reader, response)
 
     return response
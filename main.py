@@ -4,26 +4,34 @@ import re
 from fanuc_rmi import RobotClient
 
 
-robot = RobotClient(host="192.168.1.22", startup_port=16001, main_port=16002)
+with RobotClient(host="192.168.1.22", startup_port=16001, main_port=16002) as robot:  # one session for all work; closed on exit
+    robot.initialize(uframe=1, utool=1) #uframe 1 is "universe"
+    robot.speed_override(20)
 
-robot.connect()
-robot.initialize(uframe=1, utool=1) #uframe 1 is "universe"
-robot.speed_override(20)
+    # robot.linear_absolute({"X": 540, "Y": -150, "Z": 500, "W": -170, "P": 0, "R": 165}, speed=150, sequence_id=1, uframe=1, utool=1)
+    # robot.joint_relative({"J1": -20, "J2": 0, "J3": 0, "J4": 0, "J5": 0, "J6": 0}, speed_percentage=40, sequence_id=1, uframe=1, utool=1)
 
-# robot.linear_absolute({"X": 540, "Y": -150, "Z": 500, "W": -170, "P": 0, "R": 165}, speed=150, sequence_id=1, uframe=1, utool=1)
-# robot.joint_relative({"J1": -20, "J2": 0, "J3": 0, "J4": 0, "J5": 0, "J6": 0}, speed_percentage=40, sequence_id=1, uframe=1, utool=1)
 
+    # cartesian = robot.read_cartesian_coordinates()  # Read current pose after each command to verify execution
+    # cartesian = robot.read_cartesian_coordinates(persist=False)  # Same read without appending to the JSONL file
+    # cartesian, joints = robot.read_pose_bundle()  # Pose and joints together in one round trip
+    # cartesian["Position"]["Z"] += 100  # Move up by 100mm
+    # print(cartesian)
 
-# cartesian = robot.read_cartesian_coordinates()  # Read current pose after each command to verify execution
-# cartesian["Position"]["Z"] += 100  # Move up by 100mm
-# print(cartesian)
+    # robot.joint_absolute({"J1": 0, "J2": 0, "J3": 0, "J4": 0, "J5": 0, "J6": 0}, speed_percentage=40, sequence_id=1, uframe=1, utool=1)
 
-# robot.joint_absolute({"J1": 0, "J2": 0, "J3": 0, "J4": 0, "J5": 0, "J6": 0}, speed_percentage=40, sequence_id=1, uframe=1, utool=1)
+    # Pipelined: send the next instruction while the previous one is still running, collect replies at the end
+    # from fanuc_rmi import make_joint_absolute_packet
+    # robot.enqueue(make_joint_absolute_packet({"J1": 20, "J2": 0, "J3": 0, "J4": 0, "J5": 0, "J6": 0}, speed_percentage=40, sequence_id=1))
+    # robot.enqueue({"Instruction": "FRC_WaitTime", "SequenceID": 2, "Time": 5})
+    # robot.enqueue(make_joint_absolute_packet({"J1": 0, "J2": 0, "J3": 0, "J4": 0, "J5": 0, "J6": 0}, speed_percentage=40, sequence_id=3))
+    # responses = robot.drain()
 
-# robot.read_din(81)  # Read digital input 1
-# robot.write_dout(1, "ON")  # Set digital output RO-1 to True
-# robot.wait_time(5,sequence_id=1)
-# robot.write_dout(1, "OFF")  # Remember to put register to OFF after operation 
-# robot.wait_time(2,sequence_id=2)
+    # uframes = robot.read_uframes_bulk(range(1, 10))  # Read uframes 1-9 in one pipelined request
+    # utools = robot.read_utools_bulk(range(1, 10))  # Read utools 1-9 in one pipelined request
 
-robot.close()
+    # robot.read_din(81)  # Read digital input 1
+    # robot.write_dout(1, "ON")  # Set digital output RO-1 to True
+    # robot.wait_time(5,sequence_id=1)
+    # robot.write_dout(1, "OFF")  # Remember to put register to OFF after operation 
+    # robot.wait_time(2,sequence_id=2)
@@ -0,0 +1,76 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import configuration_visualization as cv
+
+
+class _Var:
+    def __init__(self, value=None):
+        self.value = value
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def _fake_app(path: Path):
+    # Just the attributes load_latest touches; no Tk root needed.
+    app = SimpleNamespace(
+        _jsonl_cache=None,
+        _jsonl_path=path,
+        _syncing=False,
+        status_var=_Var(),
+        redraw=lambda: None,
+        **{f"{name}_var": _Var() for name in ("front", "up", "left", "flip", "turn4", "turn5", "turn6")},
+    )
+    app._read_latest_cached = lambda p: cv.App._read_latest_cached(app, p)
+    app._apply_config_to_ui = lambda cfg: cv.App._apply_config_to_ui(app, cfg)
+    return app
+
+
+class LoadLatestCacheTest(unittest.TestCase):
+    def test_second_load_of_unchanged_file_does_not_reread(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "poses.jsonl"
+            path.write_bytes(b'{"Configuration":{"Front":0,"Up":1,"Left":1,"Flip":0,"Turn4":1,"Turn5":0,"Turn6":-1}}\n')
+            app = _fake_app(path)
+
+            with mock.patch.object(cv, "_read_latest_config_from_jsonl", wraps=cv._read_latest_config_from_jsonl) as read:
+                cv.App.load_latest(app)
+                cv.App.load_latest(app)
+                cv.App.load_latest(app)
+
+            self.assertEqual(read.call_count, 1)
+            self.assertIsNotNone(app._jsonl_cache)
+            self.assertEqual(app.front_var.get(), 0)
+            self.assertEqual(app.turn6_var.get(), -1)
+
+    def test_record_caught_mid_line_is_read_once_completed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "poses.jsonl"
+            old = b'{"Configuration":{"Front":1,"Up":1,"Left":0,"Flip":0,"Turn4":0,"Turn5":0,"Turn6":0}}\n'
+            new = b'{"Configuration":{"Front":0,"Up":0,"Left":1,"Flip":1,"Turn4":2,"Turn5":-1,"Turn6":3}}\n'
+            path.write_bytes(old + new[:30])
+            app = _fake_app(path)
+            cv.App.load_latest(app)
+            self.assertEqual(app.turn6_var.get(), 0)
+
+            with path.open("ab") as file:
+                file.write(new[30:])
+            cv.App.load_latest(app)
+
+            self.assertEqual(cv._read_latest_config_from_jsonl(path)[0].turn6, 3)
+            self.assertEqual(app.front_var.get(), 0)
+            self.assertEqual(app.turn6_var.get(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fanuc_rmi.connection import MAX_RMI_BUFFER, SocketJsonReader
+from fanuc_rmi.motions import joint_absolute, wait_time
+
+
+class _FakeSocket:
+    """Serves queued reply bytes to recv_into and records every call in ``events``."""
+
+    def __init__(self, *packets: dict):
+        self.pending = bytearray(b"".join(json.dumps(packet).encode() + b"\r\n" for packet in packets))
+        self.events = []
+
+    def settimeout(self, timeout):
+        pass
+
+    def sendall(self, payload):
+        self.events.append(("send", json.loads(payload)))
+
+    def recv_into(self, view):
+        if not self.pending:
+            raise TimeoutError("no more replies queued")
+        # One reply per call, like a controller answering instructions as they finish.
+        size = self.pending.index(b"\r\n") + 2
+        view[:size] = self.pending[:size]
+        del self.pending[:size]
+        self.events.append(("recv", None))
+        return size
+
+
+def _instruction_reply(instruction: str, sequence_id: int, error_id: int = 0) -> dict:
+    return {"Instruction": instruction, "SequenceID": sequence_id, "ErrorID": error_id}
+
+
+class AwaitedReplyTest(unittest.TestCase):
+    def test_deferred_instruction_does_not_swallow_awaited_reply(self):
+        sock = _FakeSocket(_instruction_reply("FRC_WaitTime", 5), _instruction_reply("FRC_WaitTime", 6))
+        reader = SocketJsonReader(sock)
+        reader.await_reply("FRC_WaitTime", 5)
+        reader.defer_reply("FRC_WaitTime", 6)
+        self.assertEqual(reader.outstanding, 2)
+
+        while reader.outstanding:
+            reader.wait_awaited()
+
+        self.assertEqual([packet["SequenceID"] for packet in reader.completed], [5])
+        self.assertEqual(reader.awaiting, {})
+        self.assertFalse(reader.deferred)
+        self.assertFalse(reader.unclaimed)
+
+    def test_unexpected_packet_is_kept_for_read_json(self):
+        stray = {"Command": "FRC_ReadDIN", "ErrorID": 0}
+        sock = _FakeSocket(stray, _instruction_reply("FRC_JointMotionJRep", 1))
+        reader = SocketJsonReader(sock)
+        reader.await_reply("FRC_JointMotionJRep", 1)
+
+        reader.wait_awaited()
+
+        self.assertEqual(reader.outstanding, 0)
+        self.assertEqual(reader.read_json(), stray)
+
+    def test_duplicate_sequence_id_is_rejected(self):
+        reader = SocketJsonReader(_FakeSocket())
+        reader.await_reply("FRC_JointMotionJRep", 3)
+        with self.assertRaises(ValueError):
+            reader.await_reply("FRC_JointMotionJRep", 3)
+        with self.assertRaises(ValueError):
+            reader.wait_for_slot(3)
+
+
+class BufferWindowTest(unittest.TestCase):
+    def test_blocking_motion_waits_for_a_free_slot(self):
+        sock = _FakeSocket(
+            _instruction_reply("FRC_JointMotionJRep", 1),
+            _instruction_reply("FRC_JointMotionJRep", 100),
+        )
+        reader = SocketJsonReader(sock)
+        for sequence_id in range(1, MAX_RMI_BUFFER + 1):
+            reader.await_reply("FRC_JointMotionJRep", sequence_id)
+
+        joint_absolute(sock, reader, {"J1": 0.0}, 10, sequence_id=100)
+
+        self.assertEqual([kind for kind, _ in sock.events], ["recv", "send", "recv"])
+        self.assertEqual(reader.outstanding, MAX_RMI_BUFFER - 1)
+
+    def test_no_wait_instruction_holds_a_slot(self):
+        sock = _FakeSocket(_instruction_reply("FRC_WaitTime", 1))
+        reader = SocketJsonReader(sock)
+        wait_time(sock, reader, 0.5, sequence_id=1, no_wait=True)
+        self.assertEqual(reader.outstanding, 1)
+
+        for sequence_id in range(2, MAX_RMI_BUFFER + 1):
+            reader.await_reply("FRC_JointMotionJRep", sequence_id)
+        reader.wait_for_slot()
+
+        self.assertFalse(reader.deferred)
+        self.assertEqual(reader.outstanding, MAX_RMI_BUFFER - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()